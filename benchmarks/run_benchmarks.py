@@ -0,0 +1,199 @@
+"""Benchmark suite for the paging, segmentation and virtual memory simulators.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 1000 100000 --output results.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+
+Each benchmark is timed on its own, then (unless --no-memory) repeated under
+tracemalloc to record its peak Python memory. Results are written as JSON.
+With --baseline, any benchmark whose throughput drops more than --tolerance
+below the stored baseline is reported and the exit status is 1.
+"""
+import argparse
+import json
+import platform
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .workloads import WORKLOADS, generate
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+NUM_FRAMES = 256
+PAGE_SIZE = 4096
+SEGMENTS_PER_PROCESS = 64
+SEGMENT_LIMIT = 4096
+
+
+def bench_paging(trace, algorithm):
+    from paging.paging import PagingSystem
+
+    def run():
+        paging_system = PagingSystem(NUM_FRAMES * PAGE_SIZE, PAGE_SIZE, NUM_FRAMES)
+        paging_system.page_requests = trace
+        paging_system.simulate_algorithm(algorithm)
+    return run
+
+
+def bench_segmentation(trace):
+    from segmentation.segmentation import SegmentationSystem
+
+    # Offsets run slightly past the segment limit so a share of translations fault
+    translations = [(process_id, page % SEGMENTS_PER_PROCESS, page * 37 % (SEGMENT_LIMIT + SEGMENT_LIMIT // 10))
+                    for process_id, page in trace]
+    process_ids = sorted(set(trace.process_ids))
+
+    def run():
+        system = SegmentationSystem()
+        base = 0
+        for process_id in process_ids:
+            for segment_id in range(SEGMENTS_PER_PROCESS):
+                system.allocate_segment(process_id, segment_id, base, SEGMENT_LIMIT)
+                base += SEGMENT_LIMIT
+        system.bulk_translate(translations)
+    return run
+
+
+def bench_segmentation_batch(trace):
+    from segmentation.segmentation import SegmentationSystem
+
+    process_ids = list(trace.process_ids)
+    segment_ids = [page % SEGMENTS_PER_PROCESS for page in trace.page_numbers]
+    offsets = [page * 37 % (SEGMENT_LIMIT + SEGMENT_LIMIT // 10) for page in trace.page_numbers]
+
+    def run():
+        system = SegmentationSystem()
+        base = 0
+        for process_id in sorted(set(process_ids)):
+            for segment_id in range(SEGMENTS_PER_PROCESS):
+                system.allocate_segment(process_id, segment_id, base, SEGMENT_LIMIT)
+                base += SEGMENT_LIMIT
+        system.translate_batch(process_ids, segment_ids, offsets)
+    return run
+
+
+def bench_virtual_memory(trace, algorithm):
+    from virtual_memory.virtual_memory import VirtualMemorySystem
+
+    pages = [(process_id, page, "data") for process_id, page in trace]
+
+    def run():
+        vm_system = VirtualMemorySystem()
+        vm_system.configure(NUM_FRAMES * PAGE_SIZE, 4 * NUM_FRAMES * PAGE_SIZE, PAGE_SIZE)
+        vm_system.run_simulation(pages, [algorithm])
+    return run
+
+
+def bench_virtual_memory_swap(trace, algorithm):
+    from virtual_memory.virtual_memory import VirtualMemorySystem
+
+    # Page-sized writes, so every victim goes through the swap file, which is large enough for every distinct page
+    payload = bytes(PAGE_SIZE)
+    pages = [(process_id, page, payload, "W") for process_id, page in trace]
+    disk_size = len(set(trace)) * PAGE_SIZE
+
+    def run():
+        vm_system = VirtualMemorySystem()
+        with tempfile.TemporaryDirectory() as directory:
+            vm_system.configure(NUM_FRAMES * PAGE_SIZE, disk_size, PAGE_SIZE, os.path.join(directory, "swap"))
+            vm_system.run_simulation(pages, [algorithm])
+            vm_system.close()
+    return run
+
+
+def benchmarks(simulators, workloads, algorithms):
+    """Yields (name, workload, factory) triples; factory builds the timed callable from a trace."""
+    for workload in workloads:
+        if "paging" in simulators:
+            for algorithm in algorithms:
+                yield f"paging/{algorithm}/{workload}", workload, lambda t, a=algorithm: bench_paging(t, a)
+        if "segmentation" in simulators:
+            yield f"segmentation/bulk_translate/{workload}", workload, bench_segmentation
+            yield f"segmentation/translate_batch/{workload}", workload, bench_segmentation_batch
+        if "virtual_memory" in simulators:
+            for algorithm in algorithms:
+                yield f"virtual_memory/{algorithm}/{workload}", workload, lambda t, a=algorithm: bench_virtual_memory(t, a)
+                yield (f"virtual_memory_swap/{algorithm}/{workload}", workload,
+                       lambda t, a=algorithm: bench_virtual_memory_swap(t, a))
+
+
+def measure(run, size, track_memory):
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    result = {"seconds": seconds, "requests_per_second": size / seconds if seconds else float("inf")}
+    if track_memory:
+        tracemalloc.start()
+        run()
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def find_regressions(results, baseline, tolerance):
+    """Returns the results whose throughput fell more than `tolerance` below the baseline."""
+    previous = {(row["benchmark"], row["size"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get((row["benchmark"], row["size"]))
+        if old and row["requests_per_second"] < old["requests_per_second"] * (1 - tolerance):
+            regressions.append({
+                "benchmark": row["benchmark"],
+                "size": row["size"],
+                "baseline_requests_per_second": old["requests_per_second"],
+                "requests_per_second": row["requests_per_second"],
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the memory management simulators.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--simulators", nargs="+", default=["paging", "segmentation", "virtual_memory"],
+                        choices=["paging", "segmentation", "virtual_memory"])
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("--algorithms", nargs="+", default=["FIFO", "LRU", "Optimal"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed throughput drop (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    traces = {}
+    for size in args.sizes:
+        for name, workload, factory in benchmarks(args.simulators, args.workloads, args.algorithms):
+            if (workload, size) not in traces:
+                traces = {(workload, size): generate(workload, size, args.seed)}
+            row = {"benchmark": name, "size": size}
+            row.update(measure(factory(traces[workload, size]), size, not args.no_memory))
+            results.append(row)
+            print(f"{name:45} {size:>10} {row['requests_per_second']:>14,.0f} req/s", flush=True)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = find_regressions(results, json.load(f), args.tolerance)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['benchmark']} @ {regression['size']}: "
+                  f"{regression['requests_per_second']:,.0f} req/s "
+                  f"(baseline {regression['baseline_requests_per_second']:,.0f})")
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import random
+from itertools import accumulate
+
+from paging.trace import PageTrace
+
+# Every generator is seeded and returns a PageTrace of (process_id, page_number)
+# requests, so a benchmark run is reproducible across machines.
+
+
+def sequential(n, run_length=8, process_id=0, seed=0):
+    """Streams through new pages, touching each one `run_length` times in a row."""
+    trace = PageTrace(1)
+    trace.process_ids.extend([process_id] * n)
+    trace.page_numbers.extend(i // run_length for i in range(n))
+    return trace
+
+
+def looping(n, loop_size=1000, process_id=0, seed=0):
+    """Cycles over the same `loop_size` pages, the classic worst case for LRU."""
+    trace = PageTrace(1)
+    trace.process_ids.extend([process_id] * n)
+    trace.page_numbers.extend(i % loop_size for i in range(n))
+    return trace
+
+
+def zipfian(n, num_pages=10000, alpha=1.0, process_id=0, seed=0):
+    """Draws pages with probability proportional to 1 / rank**alpha."""
+    rng = random.Random(seed)
+    cum_weights = list(accumulate(1 / rank ** alpha for rank in range(1, num_pages + 1)))
+    # Shuffle the ranks so that hot pages are not simply the lowest page numbers
+    pages = list(range(num_pages))
+    rng.shuffle(pages)
+    trace = PageTrace(1)
+    trace.process_ids.extend([process_id] * n)
+    trace.page_numbers.extend(rng.choices(pages, cum_weights=cum_weights, k=n))
+    return trace
+
+
+def phase_changing(n, num_pages=100000, phases=8, working_set=500, process_id=0, seed=0):
+    """Uniform accesses over a working set that moves to a new region of memory each phase."""
+    rng = random.Random(seed)
+    trace = PageTrace(1)
+    trace.process_ids.extend([process_id] * n)
+    phase_length = max(1, n // phases)
+    for start in range(0, n, phase_length):
+        base = rng.randrange(max(1, num_pages - working_set))
+        count = min(phase_length, n - start)
+        trace.page_numbers.extend(base + rng.randrange(working_set) for _ in range(count))
+    return trace
+
+
+def interleaved(n, processes=4, quantum=100, num_pages=5000, alpha=1.0, seed=0):
+    """Round-robins scheduling quanta of independent Zipfian streams, one per process."""
+    per_process = -(-n // processes)
+    streams = [zipfian(per_process, num_pages, alpha, process_id, seed + process_id)
+               for process_id in range(processes)]
+    trace = PageTrace(1)
+    for start in range(0, per_process, quantum):
+        for stream in streams:
+            trace.process_ids.extend(stream.process_ids[start:start + quantum])
+            trace.page_numbers.extend(stream.page_numbers[start:start + quantum])
+    del trace.process_ids[n:]
+    del trace.page_numbers[n:]
+    return trace
+
+
+WORKLOADS = {
+    "sequential": sequential,
+    "looping": looping,
+    "zipfian": zipfian,
+    "phase_changing": phase_changing,
+    "interleaved": interleaved,
+}
+
+
+def generate(name, n, seed=0):
+    """Returns the named workload with n requests."""
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {name}")
+    return WORKLOADS[name](n, seed=seed)
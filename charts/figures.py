@@ -0,0 +1,72 @@
+"""Display-free figure helpers shared by the simulators.
+
+Figures are built on `matplotlib.figure.Figure` instead of pyplot, so
+making one never opens a window or needs a display: the GUIs embed them in
+a `FigureCanvasQTAgg`, and headless runs write them out with `save_figure`.
+matplotlib itself is imported on first use.
+"""
+import os
+
+SAVE_FORMATS = ("png", "svg", "pdf")
+
+
+def new_figure(columns=1, figsize=(12, 6)):
+    """Returns a figure and a list of `columns` side-by-side axes."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, layout="tight")
+    return fig, list(fig.subplots(1, columns, squeeze=False)[0])
+
+
+def save_figure(fig, path, dpi=100):
+    """Renders the figure off-screen (Agg for PNG) to `path`, picking the format from its extension."""
+    file_format = os.path.splitext(path)[1][1:].lower()
+    if file_format not in SAVE_FORMATS:
+        raise ValueError(f"Unsupported image format: {path} (use one of {', '.join(SAVE_FORMATS)})")
+    fig.savefig(path, format=file_format, dpi=dpi)
+    return path
+
+
+def update_bars(ax, heights, bars=None):
+    """Sets the heights of an axes' bars in place and rescales it, for live charts.
+
+    `bars` picks which bars (by index) the heights go to; by default all of
+    them, in drawing order. The caller redraws the canvas.
+    """
+    patches = ax.patches
+    for index, height in zip(bars if bars is not None else range(len(patches)), heights):
+        patches[index].set_height(height)
+    ax.relim()
+    ax.autoscale_view()
+
+
+def interval_coverage(intervals, bins):
+    """Aggregates (start, end) intervals into the average overlap depth of `bins` equal address bins.
+
+    Returns (edges, depths) with len(edges) == len(depths) + 1. One sweep
+    over the sorted interval ends, so the cost does not grow with the width
+    of the intervals.
+    """
+    if not intervals:
+        return [0, 1], [0.0]
+    low = min(start for start, _ in intervals)
+    high = max(end for _, end in intervals)
+    width = (high - low) / bins if high > low else 1
+    edges = [low + i * width for i in range(bins)] + [high]
+    covered = [0.0] * bins
+
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    depth = 0
+    previous = low
+    for address, delta in events:
+        if depth and address > previous:
+            # Spread this constant-depth stretch over the bins it spans
+            first = min(int((previous - low) / width), bins - 1)
+            last = min(int((address - low) / width), bins - 1)
+            for index in range(first, last + 1):
+                overlap = min(address, edges[index + 1]) - max(previous, edges[index])
+                if overlap > 0:
+                    covered[index] += depth * overlap
+        depth += delta
+        previous = address
+    return edges, [total / width for total in covered]
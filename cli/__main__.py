@@ -0,0 +1,208 @@
+"""Headless command-line runner for the paging, segmentation and virtual memory simulators.
+
+Usage:
+    python -m cli paging --trace requests.txt --memory-size 1024 --page-size 256 --frames 4
+    python -m cli segmentation --segments segments.txt --translations - < translations.txt
+    python -m cli virtual_memory --trace pages.txt --ram-size 1024 --disk-size 2048 --page-size 256 --format csv
+    python -m cli virtual_memory --config run.json --output results.csv
+
+Text inputs hold one record per line or per comma, in the formats of
+example_output.txt: "process_id logical_address" for paging requests,
+"process_id segment_id base limit" for segments, "process_id segment_id
+offset" for translations and "process_id:page_number:data[:R|W]" for
+virtual memory accesses. Paging and virtual memory also take binary trace
+files. --config reads a JSON object of option values (keyed by option
+name); options given on the command line win. "-" reads from stdin.
+
+Results go to stdout or --output, as JSON or (with --format csv, or an
+output path ending in .csv) one CSV row per algorithm or translation.
+Only the headless simulator cores are imported, never Qt or matplotlib.
+"""
+import argparse
+import sys
+
+from .formats import OUTPUT_FORMATS, STDIN, is_trace_file, read_config, read_records, write_report
+
+DEFAULT_ALGORITHMS = ["FIFO", "LRU", "Optimal"]
+
+
+def _ints(fields, count, kind):
+    if len(fields) != count:
+        raise ValueError(f"Expected {count} fields per {kind}, got {' '.join(fields)!r}")
+    try:
+        return tuple(map(int, fields))
+    except ValueError:
+        raise ValueError(f"Non-integer field in {kind} {' '.join(fields)!r}") from None
+
+
+def run_paging(args):
+    from paging.paging import PagingSystem
+
+    with PagingSystem(args.memory_size, args.page_size, args.frames) as system:
+        if is_trace_file(args.trace):
+            system.load_trace_file(args.trace)
+        else:
+            requests = [_ints(fields, 2, "page request") for fields in read_records(args.trace)]
+            system.add_page_requests([request[0] for request in requests], [request[1] for request in requests])
+
+        results = {}
+        for algorithm in args.algorithms:
+            faults, seconds = system.simulate_algorithm(algorithm)
+            results[algorithm] = {"faults": faults, "seconds": seconds}
+        report = {
+            "simulator": "paging",
+            "config": {"memory_size": system.memory_size, "page_size": system.page_size, "frames": system.num_frames},
+            "requests": len(system.page_requests),
+            "results": results,
+        }
+    return report, [{"algorithm": algorithm, **result} for algorithm, result in results.items()]
+
+
+def run_segmentation(args):
+    from segmentation.segmentation import SegmentationSystem
+
+    system = SegmentationSystem(args.memory_size, args.strategy)
+    segments = [_ints(fields, 4, "segment") for fields in read_records(args.segments)]
+    overlaps = system.bulk_allocate(segments)
+    translations = []
+    if args.translations is not None:
+        translations = [_ints(fields, 3, "translation") for fields in read_records(args.translations)]
+    results = system.bulk_translate(translations)
+    report = {
+        "simulator": "segmentation",
+        "config": {"memory_size": args.memory_size, "strategy": args.strategy},
+        "segments": len(segments),
+        "overlaps": overlaps,
+        "summary": dict(system.translation_results),
+        "segment_table": system.get_segment_table(),
+        "translations": results,
+    }
+    return report, results
+
+
+def _page_access(fields):
+    if len(fields) < 3:
+        raise ValueError(f"Expected process_id:page_number:data[:R|W], got {':'.join(fields)!r}")
+    return (*_ints(fields[:2], 2, "page access"), *fields[2:])
+
+
+def run_virtual_memory(args):
+    from virtual_memory.virtual_memory import VirtualMemorySystem
+
+    system = VirtualMemorySystem(args.history_mode)
+    try:
+        system.configure(args.ram_size, args.disk_size, args.page_size, args.swap_file)
+        if args.prefetch is not None:
+            system.configure_prefetch(args.prefetch)
+        if args.compressed_pool is not None:
+            system.configure_compressed_tier(args.compressed_pool, args.codec)
+        if args.flush_interval is not None:
+            system.configure_writeback(args.flush_interval)
+        if is_trace_file(args.trace):
+            results = system.run_trace_file(args.trace, args.algorithms, args.data)
+        else:
+            pages = [_page_access(fields) for fields in read_records(args.trace, ":", 3)]
+            results = system.run_simulation(pages, args.algorithms)
+    finally:
+        system.close()
+
+    for result in results.values():
+        result["access_history"] = result["access_history"].counters()
+    report = {
+        "simulator": "virtual_memory",
+        "config": {"ram_size": args.ram_size, "disk_size": args.disk_size, "page_size": args.page_size,
+                   "frames": system.frames},
+        "results": results,
+    }
+    return report, [{"algorithm": algorithm, **result} for algorithm, result in results.items()]
+
+
+# Options each simulator cannot run without; they may come from --config instead of the command line
+REQUIRED = {
+    "paging": ("trace", "memory_size", "page_size", "frames"),
+    "segmentation": ("segments",),
+    "virtual_memory": ("trace", "ram_size", "disk_size", "page_size"),
+}
+RUNNERS = {"paging": run_paging, "segmentation": run_segmentation, "virtual_memory": run_virtual_memory}
+
+
+def build_parser():
+    """Returns the argument parser and its subparser for each simulator."""
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Run the memory management simulators "
+                                     "without a GUI.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", help="JSON file (or - for stdin) of option values")
+    common.add_argument("--output", help="results file (default: stdout)")
+    common.add_argument("--format", choices=OUTPUT_FORMATS, help="default: csv for a .csv output, else json")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    paging = commands.add_parser("paging", parents=[common], help="page replacement over a request trace")
+    paging.add_argument("--trace", help="requests (text or binary trace file, - for stdin)")
+    paging.add_argument("--memory-size", type=int)
+    paging.add_argument("--page-size", type=int)
+    paging.add_argument("--frames", type=int)
+    paging.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS)
+
+    segmentation = commands.add_parser("segmentation", parents=[common], help="segment allocation and "
+                                       "address translation")
+    segmentation.add_argument("--segments", help="segments file (- for stdin)")
+    segmentation.add_argument("--translations", help="translations file (- for stdin)")
+    segmentation.add_argument("--memory-size", type=int, help="check segments against a physical memory size")
+    segmentation.add_argument("--strategy", default="first_fit")
+
+    virtual_memory = commands.add_parser("virtual_memory", parents=[common], help="demand paging between RAM "
+                                         "and disk")
+    virtual_memory.add_argument("--trace", help="page accesses (text or binary trace file, - for stdin)")
+    virtual_memory.add_argument("--ram-size", type=int)
+    virtual_memory.add_argument("--disk-size", type=int)
+    virtual_memory.add_argument("--page-size", type=int)
+    virtual_memory.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS)
+    virtual_memory.add_argument("--data", default="data", help="page payload for binary trace files")
+    virtual_memory.add_argument("--history-mode", default="counters",
+                                help="off, counters, sampled or full (only the counters are reported)")
+    virtual_memory.add_argument("--swap-file", help="back the disk with a memory-mapped swap file at this path")
+    virtual_memory.add_argument("--prefetch", help="prefetcher name, e.g. sequential or stride")
+    virtual_memory.add_argument("--compressed-pool", type=int, help="bytes of compressed RAM tier")
+    virtual_memory.add_argument("--codec", default="zlib", help="compressed tier codec: zlib, bz2 or lzma")
+    virtual_memory.add_argument("--flush-interval", type=int, help="flush dirty pages every N accesses")
+    return parser, {"paging": paging, "segmentation": segmentation, "virtual_memory": virtual_memory}
+
+
+def parse_args(argv=None):
+    """Parses the command line, with --config supplying the values of options not given."""
+    parser, commands = build_parser()
+    args = parser.parse_args(argv)
+    if args.config is not None:
+        try:
+            config = read_config(args.config)
+        except (ValueError, OSError) as error:
+            parser.error(f"cannot read config: {error}")
+        unknown = set(config) - set(vars(args)) - {"command", "config"}
+        if unknown:
+            parser.error(f"unknown config options: {', '.join(sorted(unknown))}")
+        commands[args.command].set_defaults(**config)
+        args = parser.parse_args(argv)
+
+    missing = [name for name in REQUIRED[args.command] if getattr(args, name) is None]
+    if missing:
+        parser.error(f"missing {', '.join('--' + name.replace('_', '-') for name in missing)}")
+    inputs = [args.config] + [getattr(args, name, None) for name in ("trace", "segments", "translations")]
+    if inputs.count(STDIN) > 1:
+        parser.error("only one input can be read from stdin")
+    if args.format is None:
+        args.format = "csv" if args.output and args.output.endswith(".csv") else "json"
+    return parser, args
+
+
+def main(argv=None):
+    parser, args = parse_args(argv)
+    try:
+        report, rows = RUNNERS[args.command](args)
+        write_report(report, rows, args.output, args.format)
+    except (ValueError, OSError, MemoryError) as error:
+        parser.exit(1, f"{parser.prog}: error: {error}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import csv
+import json
+import sys
+
+from paging.trace import TRACE_MAGIC
+
+STDIN = "-"
+OUTPUT_FORMATS = ("json", "csv")
+
+
+def is_trace_file(path):
+    """Returns True if `path` is a binary trace file written by write_trace_file."""
+    if path == STDIN:
+        return False
+    with open(path, "rb") as f:
+        return f.read(len(TRACE_MAGIC)) == TRACE_MAGIC
+
+
+def read_records(source, separator=None, maxsplit=-1):
+    """Yields the field lists of a text input, streamed line by line from a path or stdin ("-").
+
+    Records are separated by newlines or commas, as in the GUI input boxes
+    ("1 0 100 50, 1 1 200 30"). Fields are split on `separator` (default:
+    whitespace). Blank records and lines starting with "#" are skipped.
+    """
+    f = sys.stdin if source == STDIN else open(source)
+    try:
+        for line in f:
+            if line.lstrip().startswith("#"):
+                continue
+            for record in line.split(","):
+                if record.strip():
+                    yield [field.strip() for field in record.strip().split(separator, maxsplit)]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def read_config(source):
+    """Reads a JSON object of option values from a path or stdin ("-")."""
+    if source == STDIN:
+        config = json.load(sys.stdin)
+    else:
+        with open(source) as f:
+            config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"Config {source} must hold a JSON object")
+    return {key.replace("-", "_"): value for key, value in config.items()}
+
+
+def flatten(row, prefix=""):
+    """Flattens nested dicts into one level with dotted keys, for CSV columns."""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def write_report(report, rows, output=None, output_format="json"):
+    """Writes the whole report as JSON, or its rows as CSV, to a path or stdout."""
+    f = sys.stdout if output in (None, STDIN) else open(output, "w", newline="")
+    try:
+        if output_format == "json":
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        else:
+            rows = [flatten(row) for row in rows]
+            columns = list(dict.fromkeys(column for row in rows for column in row))
+            writer = csv.DictWriter(f, columns, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if f is not sys.stdout:
+            f.close()
@@ -0,0 +1,50 @@
+class SimulationCancelled(Exception):
+    """Raised by an observer to stop a run at the next event it receives."""
+
+
+class Observable:
+    """Observer hook for the headless simulation cores.
+
+    Observers are callables taking `(event, payload)`. Cores check
+    `self.observers` before building an event, so a run with nobody
+    listening pays nothing per operation. An observer may raise
+    SimulationCancelled to abort the run in progress.
+    """
+
+    def __init__(self):
+        self.observers = []
+
+    def add_observer(self, callback):
+        self.observers.append(callback)
+
+    def remove_observer(self, callback):
+        self.observers.remove(callback)
+
+    def notify(self, event, payload):
+        for callback in self.observers:
+            callback(event, payload)
+
+    def track_progress(self, items, label, snapshot=dict, every=None):
+        """Wraps the items a run loops over so observers get "progress" events.
+
+        Every `every` items (default: about 1% of the run) and once at the
+        end, observers receive {label, done, total} merged with `snapshot()`,
+        e.g. the hit and fault counts so far. With no observers the items are
+        returned unwrapped.
+        """
+        if not self.observers:
+            return items
+        total = len(items) if hasattr(items, "__len__") else None
+        if every is None:
+            every = max(total // 100, 1) if total else 10000
+        return self._progress(items, label, snapshot, every, total)
+
+    def _progress(self, items, label, snapshot, every, total):
+        done = 0
+        for item in items:
+            yield item
+            done += 1
+            if done % every == 0:
+                self.notify("progress", {"label": label, "done": done, "total": total, **snapshot()})
+        if done % every:
+            self.notify("progress", {"label": label, "done": done, "total": total, **snapshot()})
@@ -0,0 +1,144 @@
+import threading
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+from .observable import SimulationCancelled
+
+
+class QtEventBridge(QObject):
+    """Forwards events from a headless simulator to Qt, coalesced into batches.
+
+    Events are buffered and delivered together once `batch_size` events are
+    pending or `interval_ms` has passed since the first one, whichever comes
+    first. Events named in `immediate` (such as the end of a run) flush the
+    buffer straight away. With `events`, only those event names are kept.
+
+    The simulator may run on another thread: events are buffered under a
+    lock and batches are always delivered on the thread that owns the bridge.
+    """
+
+    batch_ready = pyqtSignal(list)  # [(event, payload), ...]
+    _wake = pyqtSignal(bool)  # True: flush now, False: start the batching timer
+
+    def __init__(self, source, parent=None, batch_size=256, interval_ms=50, immediate=("simulation_complete",),
+                 events=None):
+        super().__init__(parent)
+        self.source = source
+        self.batch_size = batch_size
+        self.immediate = set(immediate)
+        self.events = set(events) if events is not None else None
+        self.pending = []
+        self.lock = threading.Lock()
+        self.handlers = {}
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+        # Direct when emitted on the bridge's thread, queued from a worker thread
+        self._wake.connect(self._on_wake)
+        source.add_observer(self._on_event)
+
+    def subscribe(self, event, handler):
+        """Calls handler(payload) for every event of this name, when its batch is delivered."""
+        self.handlers.setdefault(event, []).append(handler)
+
+    def _on_event(self, event, payload):
+        if self.events is not None and event not in self.events:
+            return
+        with self.lock:
+            self.pending.append((event, payload))
+            count = len(self.pending)
+        if event in self.immediate or count == self.batch_size:
+            self._wake.emit(True)
+        elif count == 1:
+            self._wake.emit(False)
+
+    @pyqtSlot(bool)
+    def _on_wake(self, now):
+        if now:
+            self.flush()
+        elif not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return
+        self.batch_ready.emit(batch)
+        for event, payload in batch:
+            for handler in self.handlers.get(event, ()):
+                handler(payload)
+
+    def close(self):
+        """Delivers anything still pending and stops listening to the source."""
+        self.flush()
+        self.source.remove_observer(self._on_event)
+
+
+class SimulationWorker(QObject):
+    """Runs `job()` on a QThread with cooperative cancellation.
+
+    While the job runs the worker observes `source`; after `cancel()` it
+    raises SimulationCancelled from the next event the simulator sends,
+    which unwinds the run. Exactly one of `finished(result)`, `cancelled()`
+    or `failed(message)` is emitted, then `done()`. Any exception the job
+    raises becomes `failed`: an exception escaping a slot would abort the
+    whole application.
+    """
+
+    finished = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+    done = pyqtSignal()
+
+    def __init__(self, source, job):
+        super().__init__()
+        self.source = source
+        self.job = job
+        self.cancel_requested = False
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def _check_cancel(self, event, payload):
+        if self.cancel_requested:
+            raise SimulationCancelled()
+
+    @pyqtSlot()
+    def run(self):
+        self.source.add_observer(self._check_cancel)
+        try:
+            result = self.job()
+        except SimulationCancelled:
+            self.cancelled.emit()
+        except Exception as error:
+            self.failed.emit(str(error) or type(error).__name__)
+        else:
+            self.finished.emit(result)
+        finally:
+            self.source.remove_observer(self._check_cancel)
+            self.done.emit()
+
+
+def start_worker(parent, source, job, finished=None, cancelled=None, failed=None):
+    """Runs `job` in a SimulationWorker on a new QThread and returns the worker.
+
+    The given slots are connected before the thread starts, so no outcome
+    can be missed. The thread quits and both objects are deleted when the
+    job is done.
+    """
+    thread = QThread(parent)
+    worker = SimulationWorker(source, job)
+    worker.moveToThread(thread)
+    for signal, slot in ((worker.finished, finished), (worker.cancelled, cancelled), (worker.failed, failed)):
+        if slot is not None:
+            signal.connect(slot)
+    thread.started.connect(worker.run)
+    worker.done.connect(thread.quit)
+    worker.done.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return worker
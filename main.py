@@ -1,28 +1,53 @@
+import time
+
+STARTED = time.perf_counter()  # Reference point for --startup-time
+
+import argparse
+import os
+import struct
 import sys
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, 
                             QLabel, QFrame, QScrollArea, QHBoxLayout)
-from PyQt6.QtGui import QFont, QPixmap, QIcon, QPainter, QColor
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QFont, QPixmap, QIcon, QPainter, QColor, QImage
+from PyQt6.QtCore import Qt, QSize, QStandardPaths, QTimer, pyqtSignal
+
+# The simulator GUIs (and through them matplotlib) are imported when their button is clicked
+
+IMPORTED = time.perf_counter()
+
+# Assets are found next to this file, whatever the working directory
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKGROUND_IMAGE = os.path.join(ASSET_DIR, "memory_image.webp")
+BACKGROUND_OPACITY = 180
+
+# Rendered background cache: a header keyed by the source file and opacity, then raw premultiplied ARGB pixels
+BACKGROUND_CACHE_MAGIC = b"MMBG"
+BACKGROUND_CACHE_HEADER = struct.Struct("<4sqqIIII")  # magic, source size, source mtime_ns, opacity, width, height, bytes per line
+
+
+def background_cache_path():
+    cache_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(cache_dir, "memory-management-os", "background.argb")
 
-# Import the actual GUI implementations from relevant modules
-from paging.paging_gui import PagingGUI
-from segmentation.segmentation_gui import SegmentationGUI
-from virtual_memory.virtual_memory_gui import VirtualMemoryGUI
 
 class MainGUI(QWidget):
+    background_loaded = pyqtSignal(str)  # How the background was obtained: "from cache", "decoded" or "missing"
+
     def __init__(self):
         super().__init__()
+        self.first_paint_at = None
+        self.background_at = None
         self.init_ui()
+        self.built_at = time.perf_counter()
 
     def init_ui(self):
         self.setWindowTitle("Memory Management Simulator")
         self.setGeometry(200, 200, 600, 600)
         
-        self.setWindowIcon(QIcon("icons/app_icon.png"))
+        self.setWindowIcon(QIcon(os.path.join(ASSET_DIR, "icons/app_icon.png")))
 
+        # The background is decoded after the first paint, see paintEvent
         self.background_label = QLabel(self)
-        pixmap = QPixmap("memory_image.webp")
-        self.background_label.setPixmap(self.make_translucent(pixmap, 180))  # Adjust transparency
         self.background_label.setScaledContents(True)
         self.background_label.setGeometry(0, 0, self.width(), self.height())
 
@@ -45,16 +70,16 @@ class MainGUI(QWidget):
         subheading.setStyleSheet("color: #2D1B69;")  
         layout.addWidget(subheading)
 
-        self.add_explanation(layout, "What is Paging?", "Paging is a memory management scheme that eliminates the need for contiguous allocation of physical memory.", "icons/paging.png")
-        self.paging_button = self.create_button("Paging Simulator", self.open_paging_gui, "icons/play.png")
+        self.add_explanation(layout, "What is Paging?", "Paging is a memory management scheme that eliminates the need for contiguous allocation of physical memory.", os.path.join(ASSET_DIR, "icons/paging.png"))
+        self.paging_button = self.create_button("Paging Simulator", self.open_paging_gui, os.path.join(ASSET_DIR, "icons/play.png"))
         layout.addWidget(self.paging_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
-        self.add_explanation(layout, "What is Segmentation?", "Segmentation divides memory into variable-sized segments representing logical groupings.", "icons/segmentation.png")
-        self.segmentation_button = self.create_button("Segmentation Simulator", self.open_segmentation_gui, "icons/play.png")
+        self.add_explanation(layout, "What is Segmentation?", "Segmentation divides memory into variable-sized segments representing logical groupings.", os.path.join(ASSET_DIR, "icons/segmentation.png"))
+        self.segmentation_button = self.create_button("Segmentation Simulator", self.open_segmentation_gui, os.path.join(ASSET_DIR, "icons/play.png"))
         layout.addWidget(self.segmentation_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
-        self.add_explanation(layout, "What is Virtual Memory?", "Virtual memory allows programs to use more memory than physically available by swapping data.", "icons/virtual_memory.png")
-        self.virtual_memory_button = self.create_button("Virtual Memory Simulator", self.open_virtual_memory_gui, "icons/play.png")
+        self.add_explanation(layout, "What is Virtual Memory?", "Virtual memory allows programs to use more memory than physically available by swapping data.", os.path.join(ASSET_DIR, "icons/virtual_memory.png"))
+        self.virtual_memory_button = self.create_button("Virtual Memory Simulator", self.open_virtual_memory_gui, os.path.join(ASSET_DIR, "icons/play.png"))
         layout.addWidget(self.virtual_memory_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         footer = QLabel("© 2025 Memory Management Simulator")
@@ -130,25 +155,113 @@ class MainGUI(QWidget):
         
         return new_pixmap
 
+    def load_background(self, path=BACKGROUND_IMAGE, opacity=BACKGROUND_OPACITY):
+        """Shows the translucent background, rendered once and then read back from the cache.
+
+        Decoding the WebP and repainting it translucent takes tens of
+        milliseconds; the raw pixels of the result load in a few. The cache
+        is rebuilt whenever the image file or the opacity changes. Without
+        the image the window simply has no background; this runs in a timer
+        slot, where an exception would abort the application.
+        """
+        try:
+            source = os.stat(path)
+        except OSError:
+            source = None
+        how = "missing"
+        if source is not None:
+            key = (source.st_size, source.st_mtime_ns, opacity)
+            pixmap = self.read_background_cache(key)
+            how = "from cache"
+            if pixmap is None:
+                pixmap = QPixmap(path)
+                how = "missing" if pixmap.isNull() else "decoded"
+                if not pixmap.isNull():
+                    pixmap = self.make_translucent(pixmap, opacity)
+                    self.write_background_cache(key, pixmap)
+            if how != "missing":
+                self.background_label.setPixmap(pixmap)
+        self.background_at = time.perf_counter()
+        self.background_loaded.emit(how)
+
+    def read_background_cache(self, key):
+        try:
+            with open(background_cache_path(), "rb") as f:
+                magic, *cached_key, width, height, bytes_per_line = BACKGROUND_CACHE_HEADER.unpack(
+                    f.read(BACKGROUND_CACHE_HEADER.size))
+                pixels = f.read()
+        except (OSError, struct.error):
+            return None
+        if magic != BACKGROUND_CACHE_MAGIC or tuple(cached_key) != key or len(pixels) != height * bytes_per_line:
+            return None
+        image = QImage(pixels, width, height, bytes_per_line, QImage.Format.Format_ARGB32_Premultiplied)
+        return QPixmap.fromImage(image)
+
+    def write_background_cache(self, key, pixmap):
+        image = pixmap.toImage().convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+        path = background_cache_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(BACKGROUND_CACHE_HEADER.pack(BACKGROUND_CACHE_MAGIC, *key, image.width(), image.height(),
+                                                     image.bytesPerLine()))
+                f.write(image.constBits().asstring(image.sizeInBytes()))
+        except OSError:
+            pass  # A read-only cache just means decoding again next launch
+
     def open_paging_gui(self):
+        from paging.paging_gui import PagingGUI
+
         self.paging_window = PagingGUI()
         self.paging_window.show()
 
     def open_segmentation_gui(self):
+        from segmentation.segmentation_gui import SegmentationGUI
+
         self.segmentation_window = SegmentationGUI()
         self.segmentation_window.show()
 
     def open_virtual_memory_gui(self):
+        from virtual_memory.virtual_memory_gui import VirtualMemoryGUI
+
         self.virtual_memory_window = VirtualMemoryGUI()
         self.virtual_memory_window.show()
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint_at is None:
+            self.first_paint_at = time.perf_counter()
+            QTimer.singleShot(0, self.load_background)
+
     def resizeEvent(self, event):
         self.background_label.setGeometry(0, 0, self.width(), self.height())
         super().resizeEvent(event)
 
+def report_startup(window, background):
+    """Prints the --startup-time milestones, in milliseconds since main.py started."""
+    milestones = [
+        ("imports", IMPORTED),
+        ("window built", window.built_at),
+        ("first paint", window.first_paint_at),
+        ("background " + background, window.background_at),
+    ]
+    for name, at in milestones:
+        print(f"{name:24} {(at - STARTED) * 1000:8.1f} ms")
+    loaded = [module for module in ("matplotlib", "paging.paging_gui", "segmentation.segmentation_gui",
+                                    "virtual_memory.virtual_memory_gui") if module in sys.modules]
+    print(f"{'loaded at startup':24} {', '.join(loaded) or 'none of the simulators or matplotlib'}")
+    QApplication.quit()
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Memory Management Simulator")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print the time to first paint and to the background, then exit")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setFont(QFont("Arial", 10))
     window = MainGUI()
+    if args.startup_time:
+        window.background_loaded.connect(lambda background: report_startup(window, background))
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,247 @@
+import time
+from collections import OrderedDict, deque
+
+from .policies import create_policy
+
+
+def process_sizes(page_requests):
+    """Returns the number of distinct pages each process references."""
+    pages = {}
+    for process_id, page in page_requests:
+        pages.setdefault(process_id, set()).add(page)
+    return {process_id: len(distinct) for process_id, distinct in pages.items()}
+
+
+def equal_allocation(num_frames, sizes):
+    """Splits the frames evenly between processes (at least one each)."""
+    share, extra = divmod(num_frames, len(sizes)) if sizes else (0, 0)
+    return {process_id: max(1, share + (i < extra)) for i, process_id in enumerate(sorted(sizes))}
+
+
+def proportional_allocation(num_frames, sizes):
+    """Splits the frames in proportion to each process's size, by largest remainder (at least one each)."""
+    total = sum(sizes.values())
+    if not total:
+        return {}
+    exact = {process_id: num_frames * size / total for process_id, size in sizes.items()}
+    quotas = {process_id: int(share) for process_id, share in exact.items()}
+    leftover = num_frames - sum(quotas.values())
+    for process_id in sorted(exact, key=lambda pid: quotas[pid] - exact[pid])[:leftover]:
+        quotas[process_id] += 1
+    return {process_id: max(1, frames) for process_id, frames in quotas.items()}
+
+
+class _ProcessStats:
+    __slots__ = ("accesses", "faults", "frames")
+
+    def __init__(self):
+        self.accesses = 0
+        self.faults = 0
+        self.frames = 0  # Allocated frames, or the peak resident set for dynamic allocators
+
+
+def _run_global(page_requests, num_frames, algorithm, stats):
+    policy = create_policy(algorithm, num_frames)
+    if policy.needs_lookahead:
+        policy.prepare(page_requests)
+    resident = set()
+    resident_count = {}
+    for key in page_requests:
+        process = stats.get(key[0])
+        if process is None:
+            process = stats[key[0]] = _ProcessStats()
+        process.accesses += 1
+        if key in resident:
+            policy.on_hit(key)
+            continue
+        process.faults += 1
+        if len(resident) >= num_frames:
+            victim = policy.choose_victim(key)
+            resident.remove(victim)
+            resident_count[victim[0]] -= 1
+        resident.add(key)
+        policy.on_miss(key)
+        resident_count[key[0]] = count = resident_count.get(key[0], 0) + 1
+        process.frames = max(process.frames, count)
+    return 0
+
+
+def _run_local(page_requests, num_frames, quotas, algorithm, stats):
+    policies = {process_id: create_policy(algorithm, frames) for process_id, frames in quotas.items()}
+    if any(policy.needs_lookahead for policy in policies.values()):
+        per_process = {process_id: [] for process_id in quotas}
+        for key in page_requests:
+            per_process[key[0]].append(key)
+        for process_id, policy in policies.items():
+            policy.prepare(per_process[process_id])
+    residents = {process_id: set() for process_id in quotas}
+    for process_id, frames in quotas.items():
+        stats[process_id] = _ProcessStats()
+        stats[process_id].frames = frames
+
+    for key in page_requests:
+        process = stats[key[0]]
+        policy = policies[key[0]]
+        resident = residents[key[0]]
+        process.accesses += 1
+        if key in resident:
+            policy.on_hit(key)
+            continue
+        process.faults += 1
+        if len(resident) >= policy.num_frames:
+            resident.remove(policy.choose_victim(key))
+        resident.add(key)
+        policy.on_miss(key)
+    # The minimum of one frame per process can hand out more frames than exist
+    return sum(process.accesses for process in stats.values()) if sum(quotas.values()) > num_frames else 0
+
+
+def _run_working_set(page_requests, num_frames, window, stats):
+    """Denning's working set: a process keeps exactly the pages it touched in its last `window` references.
+
+    When the working sets outgrow physical memory, the least recently active
+    other process is deactivated: its whole working set is swapped out and
+    faults back in when it runs again. A lone process whose working set
+    exceeds memory loses its least recently used pages instead.
+    """
+    last_use = {}  # process_id -> {page: virtual time of last reference}
+    history = {}  # process_id -> deque of (virtual time, page)
+    last_active = {}  # process_id -> position in the trace of its latest reference
+    total_resident = 0
+    overcommitted = 0
+    for position, (process_id, page) in enumerate(page_requests):
+        process = stats.get(process_id)
+        if process is None:
+            process = stats[process_id] = _ProcessStats()
+            last_use[process_id] = {}
+            history[process_id] = deque()
+        working_set = last_use[process_id]
+        references = history[process_id]
+        now = process.accesses
+        process.accesses += 1
+        last_active[process_id] = position
+
+        # Drop pages whose last reference has left the window
+        while references and references[0][0] <= now - window:
+            then, old_page = references.popleft()
+            if working_set.get(old_page) == then:
+                del working_set[old_page]
+                total_resident -= 1
+
+        if page not in working_set:
+            process.faults += 1
+            total_resident += 1
+        working_set[page] = now
+        references.append((now, page))
+
+        if total_resident > num_frames:
+            overcommitted += 1
+            while total_resident > num_frames:
+                others = [pid for pid, pages in last_use.items() if pages and pid != process_id]
+                if others:
+                    inactive = min(others, key=last_active.__getitem__)
+                    total_resident -= len(last_use[inactive])
+                    last_use[inactive].clear()
+                    history[inactive].clear()
+                    continue
+                then, old_page = references.popleft()
+                if working_set.get(old_page) == then:
+                    del working_set[old_page]
+                    total_resident -= 1
+        process.frames = max(process.frames, len(working_set))
+    return overcommitted
+
+
+def _run_pff(page_requests, num_frames, threshold, stats):
+    """Page-fault frequency: grow on frequent faults, shed unreferenced pages when faults are rare."""
+    residents = {}  # process_id -> OrderedDict of resident pages, least recently used first
+    last_fault = {}
+    total_resident = 0
+    overcommitted = 0
+    for process_id, page in page_requests:
+        process = stats.get(process_id)
+        if process is None:
+            process = stats[process_id] = _ProcessStats()
+            residents[process_id] = OrderedDict()
+            last_fault[process_id] = 0
+        resident = residents[process_id]
+        now = process.accesses
+        process.accesses += 1
+
+        if page in resident:
+            resident.move_to_end(page)
+            resident[page] = now
+            continue
+
+        process.faults += 1
+        if now - last_fault[process_id] > threshold:
+            # Faults are rare: release every page not referenced since the previous fault
+            for stale in [p for p, used in resident.items() if used < last_fault[process_id]]:
+                del resident[stale]
+                total_resident -= 1
+        if total_resident >= num_frames:
+            # The process wants another frame but memory is full: replace locally instead
+            overcommitted += 1
+            if resident:
+                resident.popitem(last=False)
+                total_resident -= 1
+        last_fault[process_id] = now
+        resident[page] = now
+        total_resident += 1
+        process.frames = max(process.frames, len(resident))
+    return overcommitted
+
+
+ALLOCATORS = ("equal", "proportional", "working_set", "pff")
+
+
+def simulate_allocation(page_requests, num_frames, algorithm="LRU", mode="global", allocator="equal",
+                        window=100, pff_threshold=10, thrashing_fault_rate=0.5):
+    """Simulates global replacement, or local replacement with a per-process frame allocator.
+
+    In local mode, `equal` and `proportional` give each process a fixed quota
+    replaced with `algorithm`; `working_set` (Denning window, in references of
+    the process itself) and `pff` (page-fault frequency) size each resident
+    set dynamically, within `num_frames` frames in total. A process is flagged
+    as thrashing when its fault rate reaches `thrashing_fault_rate`; the
+    dynamic allocators also count the accesses during which the processes
+    demand more than `num_frames` frames.
+    """
+    if mode not in ("global", "local"):
+        raise ValueError(f"Unknown allocation mode: {mode}")
+    if mode == "local" and allocator not in ALLOCATORS:
+        raise ValueError(f"Unknown frame allocator: {allocator}")
+
+    stats = {}
+    start_time = time.perf_counter()
+    if mode == "global":
+        overcommitted = _run_global(page_requests, num_frames, algorithm, stats)
+    elif allocator == "working_set":
+        overcommitted = _run_working_set(page_requests, num_frames, window, stats)
+    elif allocator == "pff":
+        overcommitted = _run_pff(page_requests, num_frames, pff_threshold, stats)
+    else:
+        sizes = process_sizes(page_requests)
+        allocate = equal_allocation if allocator == "equal" else proportional_allocation
+        overcommitted = _run_local(page_requests, num_frames, allocate(num_frames, sizes), algorithm, stats)
+    exec_time = time.perf_counter() - start_time
+
+    processes = {}
+    for process_id, process in stats.items():
+        fault_rate = process.faults / process.accesses if process.accesses else 0.0
+        processes[process_id] = {
+            "accesses": process.accesses,
+            "faults": process.faults,
+            "fault_rate": fault_rate,
+            "frames": process.frames,
+            "thrashing": fault_rate >= thrashing_fault_rate,
+        }
+    return {
+        "mode": mode,
+        "allocator": allocator if mode == "local" else None,
+        "page_faults": sum(process.faults for process in stats.values()),
+        "exec_time": exec_time,
+        "processes": processes,
+        "overcommitted_accesses": overcommitted,
+        "thrashing": overcommitted > 0 or any(process["thrashing"] for process in processes.values()),
+    }
@@ -1,105 +1,165 @@
 import time
 
-class PagingSystem:
-    def __init__(self, memory_size, page_size, num_frames):
+from events.observable import Observable
+from .allocation import simulate_allocation
+from .policies import create_policy
+from .stack_distance import fault_curve
+from .trace import PageTrace, TraceFile
+
+class PagingSystem(Observable):
+    """Global page replacement over a fixed number of frames.
+
+    While observed, runs report "progress" events ({label, done, total,
+    faults}) and can be stopped by an observer raising SimulationCancelled.
+    """
+
+    def __init__(self, memory_size, page_size, num_frames, tlb=None):
+        if num_frames <= 0:
+            raise ValueError("Number of frames must be positive")
+        if page_size <= 0:
+            raise ValueError("Page size must be positive")
+        super().__init__()
         self.memory_size = memory_size
         self.page_size = page_size
         self.num_frames = num_frames
-        self.frames = [-1] * num_frames  # Empty frames
+        self.tlb = tlb  # Optional TLB consulted before the page table
+        self.page_requests = PageTrace(page_size)
+        self.reset_state()
+
+    def reset_state(self):
+        """Clears frames and page tables so each run starts from an empty memory."""
+        self.frames = [-1] * self.num_frames  # Empty frames
         self.page_table = {}  # Stores mappings for each process
-        self.page_requests = []
+        self.page_faults = 0
+        if self.tlb is not None:
+            self.tlb.reset()
 
     def add_page_request(self, process_id, logical_address):
         """Adds a page request for translation."""
         page_number = logical_address // self.page_size
         if process_id not in self.page_table:
             self.page_table[process_id] = []
-        self.page_requests.append((process_id, page_number))
+        self.page_requests.append(process_id, page_number)
+
+    def add_page_requests(self, process_ids, logical_addresses):
+        """Bulk-adds page requests; process_ids is one ID or one per address."""
+        self.page_requests.add_addresses(process_ids, logical_addresses)
+
+    def load_trace_file(self, path):
+        """Uses a memory-mapped binary trace file as the page request stream, closing any previous one."""
+        trace = TraceFile(path)
+        self.close()
+        self.page_requests = trace
+        self.page_size = trace.page_size
+        return trace
+
+    def close(self):
+        """Unmaps the loaded trace file, if any; the request stream becomes an empty PageTrace."""
+        if isinstance(self.page_requests, TraceFile):
+            self.page_requests.close()
+            self.page_requests = PageTrace(self.page_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def simulate_algorithm(self, algorithm):
-        """Runs FIFO, LRU, or Optimal page replacement algorithm."""
-        if algorithm == "FIFO":
-            return self.fifo()
-        elif algorithm == "LRU":
-            return self.lru()
-        elif algorithm == "Optimal":
-            return self.optimal()
+        """Runs a registered page replacement policy (FIFO, LRU, Optimal, CLOCK, LFU, 2Q, ARC) on fresh state."""
+        self.reset_state()
+        return self.run_policy(create_policy(algorithm, self.num_frames))
 
-    def optimal(self):
-        """Simulates Optimal page replacement."""
-        page_faults = 0
-        start_time = time.perf_counter()
+    def fault_curve(self, algorithm="LRU", max_frames=None):
+        """Returns fault counts for every frame count from 0 to max_frames in a single pass."""
+        return fault_curve(self.page_requests, algorithm, max_frames)
 
-        for i, (process_id, page) in enumerate(self.page_requests):
-            if process_id not in self.page_table:
-                self.page_table[process_id] = []
-
-            if page not in self.page_table[process_id]:
-                page_faults += 1
-                if len(self.page_table[process_id]) < self.num_frames:
-                    self.page_table[process_id].append(page)
-                else:
-                    future_use = {}
-                    for j in range(i + 1, len(self.page_requests)):
-                        future_process, future_page = self.page_requests[j]
-                        if future_process == process_id and future_page in self.page_table[process_id]:
-                            future_use[future_page] = j
-
-                    removed_page = min(self.page_table[process_id], key=lambda p: future_use.get(p, float("inf")))
-                    self.page_table[process_id].remove(removed_page)
-                    self.page_table[process_id].append(page)
+    def run_policy(self, policy):
+        """Simulates global page replacement over all frames, driven by a policy object."""
+        start_time = time.perf_counter()
+        if policy.needs_lookahead:
+            policy.prepare(self.page_requests)
+        on_hit, on_miss, choose_victim = policy.on_hit, policy.on_miss, policy.choose_victim
+        tlb = self.tlb
+        resident = set()
+        self.page_faults = 0
+
+        for key in self.track_progress(self.page_requests, policy.name, lambda: {"faults": self.page_faults}):
+            # A TLB hit implies the page is resident: evicted pages are invalidated below
+            if tlb is not None and tlb.lookup(key):
+                on_hit(key)
+            elif key in resident:
+                on_hit(key)
+            else:
+                self.page_faults += 1
+                if len(resident) >= self.num_frames:
+                    victim = choose_victim(key)
+                    resident.remove(victim)
+                    if tlb is not None:
+                        tlb.invalidate(victim)
+                resident.add(key)
+                on_miss(key)
 
         exec_time = time.perf_counter() - start_time
-        return page_faults, exec_time
+        self._store_resident(resident)
+        return self.page_faults, exec_time
+
+    def simulate_allocation(self, algorithm="LRU", mode="global", allocator="equal", **params):
+        """Runs global replacement or local replacement with a per-process frame allocator.
+
+        Returns total and per-process fault counts plus thrashing indicators.
+        """
+        self.reset_state()
+        return simulate_allocation(self.page_requests, self.num_frames, algorithm, mode, allocator, **params)
+
+    def tlb_report(self, page_faults=0, **latencies):
+        """Returns TLB hits, misses, page walks and effective access time for the last run."""
+        if self.tlb is None:
+            raise ValueError("No TLB attached to this PagingSystem")
+        return self.tlb.report(page_faults, **latencies)
+
+    def create_visualization(self, results, output_path=None):
+        """Charts page faults and execution time per algorithm from {algorithm: (faults, seconds)}.
+
+        Returns the figure, or the path it was written to off-screen when
+        `output_path` (.png/.svg/.pdf) is given.
+        """
+        from charts.figures import new_figure, save_figure  # Loaded on first use so the core stays headless
+
+        algorithms = list(results.keys())
+        page_faults = [results[algo][0] for algo in algorithms]
+        exec_times = [results[algo][1] for algo in algorithms]
+
+        fig, (ax1,) = new_figure(figsize=(8, 5))
+        ax1.bar(algorithms, page_faults, color='c', alpha=0.7, label='Page Faults')
+        ax1.set_xlabel("Paging Algorithms", fontsize=14)
+        ax1.set_ylabel("Page Faults", color='c', fontsize=14)
+        ax1.tick_params(axis='y', labelcolor='c')
+
+        ax2 = ax1.twinx()
+        ax2.plot(algorithms, exec_times, color='r', marker='o', linestyle='-', linewidth=2, label='Execution Time')
+        ax2.set_ylabel("Execution Time (seconds)", color='r', fontsize=14)
+        ax2.tick_params(axis='y', labelcolor='r')
+
+        ax1.set_title("Page Faults & Execution Time Comparison", fontsize=16)
+        ax1.grid(True)
+        if output_path is not None:
+            return save_figure(fig, output_path)
+        return fig
+
+    def optimal(self):
+        """Simulates Optimal page replacement."""
+        return self.simulate_algorithm("Optimal")
 
     def fifo(self):
         """Simulates FIFO page replacement."""
-        queue = []
-        page_faults = 0
-        start_time = time.perf_counter()
-
-        for process_id, page in self.page_requests:
-            if process_id not in self.page_table:
-                self.page_table[process_id] = []
-
-            if page not in self.page_table[process_id]:
-                page_faults += 1
-                if len(queue) < self.num_frames:
-                    queue.append(page)
-                else:
-                    removed_page = queue.pop(0)
-                    if removed_page in self.page_table[process_id]:  
-                        self.page_table[process_id].remove(removed_page)
-                    queue.append(page)
-                self.page_table[process_id].append(page)
-
-        exec_time = time.perf_counter() - start_time
-        return page_faults, exec_time
+        return self.simulate_algorithm("FIFO")
 
     def lru(self):
         """Simulates LRU page replacement."""
-        page_stack = []
-        page_faults = 0
-        start_time = time.perf_counter()
+        return self.simulate_algorithm("LRU")
 
-        for process_id, page in self.page_requests:
-            if process_id not in self.page_table:
-                self.page_table[process_id] = []
-
-            if page not in self.page_table[process_id]:
-                page_faults += 1
-                if len(page_stack) < self.num_frames:
-                    page_stack.append(page)
-                else:
-                    removed_page = page_stack.pop(0)
-                    if removed_page in self.page_table[process_id]:  
-                        self.page_table[process_id].remove(removed_page)
-                    page_stack.append(page)
-                self.page_table[process_id].append(page)
-            else:
-                if page in page_stack:
-                    page_stack.remove(page)
-                page_stack.append(page)
-
-        exec_time = time.perf_counter() - start_time
-        return page_faults, exec_time
+    def _store_resident(self, resident):
+        """Rebuilds the per-process page table from the resident (process_id, page) keys, without rereading the trace."""
+        for process_id, page in resident:
+            self.page_table.setdefault(process_id, []).append(page)
@@ -1,8 +1,12 @@
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit, \
+    QProgressBar
 from PyQt6.QtGui import QPalette, QColor
-import matplotlib.pyplot as plt
+from charts.figures import update_bars
+from events.qt_bridge import QtEventBridge, start_worker
 from .paging import PagingSystem
 
+ALGORITHMS = ["FIFO", "LRU", "Optimal"]
+
 class PagingGUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -37,15 +41,31 @@ class PagingGUI(QWidget):
         self.layout.addWidget(self.request_label)
         self.layout.addWidget(self.request_input)
 
-        # Apply Thistle color to the button
+        # Apply Thistle color to the buttons
+        buttons = QHBoxLayout()
         self.run_button = QPushButton("Run Paging Simulation")
         self.run_button.setStyleSheet("background-color: #D8BFD8; color: black;")  # Thistle color
         self.run_button.clicked.connect(self.run_paging)
-        self.layout.addWidget(self.run_button)
+        buttons.addWidget(self.run_button)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet("background-color: #D8BFD8; color: black;")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_paging)
+        buttons.addWidget(self.cancel_button)
+        self.layout.addLayout(buttons)
+
+        self.progress_bar = QProgressBar()
+        self.layout.addWidget(self.progress_bar)
 
         self.output_label = QLabel("")
         self.layout.addWidget(self.output_label)
 
+        self.canvas = None
+        self.paging_system = None
+        self.events = None
+        self.worker = None
+
         self.setLayout(self.layout)
 
     def run_paging(self):
@@ -55,46 +75,72 @@ class PagingGUI(QWidget):
             num_frames = int(self.num_frames_input.text())
 
             page_requests_text = self.request_input.toPlainText().strip()
-            page_requests = []
+            paging_system = PagingSystem(memory_size, page_size, num_frames)
 
             if page_requests_text:
                 for line in page_requests_text.split("\n"):
                     parts = line.strip().split()
                     if len(parts) == 2:
                         process_id, logical_address = int(parts[0]), int(parts[1])
-                        page_requests.append((process_id, logical_address // page_size))
-
-            paging_system = PagingSystem(memory_size, page_size, num_frames)
-            paging_system.page_requests = page_requests  
-
-            results = {
-                "FIFO": paging_system.simulate_algorithm("FIFO"),
-                "LRU": paging_system.simulate_algorithm("LRU"),
-                "Optimal": paging_system.simulate_algorithm("Optimal"),
-            }
-
-            self.display_results(results)
+                        paging_system.add_page_request(process_id, logical_address)
 
         except ValueError:
             self.output_label.setText("Invalid input! Please enter numbers correctly.")
+            return
+
+        # Simulate on a worker thread, charting faults live from throttled progress events
+        if self.events is not None:
+            self.events.close()
+        self.paging_system = paging_system
+        self.events = QtEventBridge(paging_system, self, events=("progress",))
+        self.events.subscribe("progress", self.update_progress)
+        self.show_canvas(paging_system.create_visualization({algo: (0, 0.0) for algo in ALGORITHMS}))
+        self.output_label.setText("")
+        self.progress_bar.setValue(0)
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.worker = start_worker(self, paging_system, self.simulate_all, finished=self.display_results,
+                                   cancelled=self.paging_cancelled,
+                                   failed=self.output_label.setText)
+        self.worker.done.connect(self.paging_done)
+
+    def simulate_all(self):
+        """Runs on the worker thread."""
+        return {algo: self.paging_system.simulate_algorithm(algo) for algo in ALGORITHMS}
+
+    def cancel_paging(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def paging_cancelled(self):
+        self.output_label.setText("Simulation cancelled.")
+
+    def paging_done(self):
+        self.worker = None
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def update_progress(self, progress):
+        """Advances the progress bar and the live page fault bar of the running algorithm."""
+        if progress["label"] not in ALGORITHMS or self.canvas is None:
+            return
+        position = ALGORITHMS.index(progress["label"])
+        if progress["total"]:
+            self.progress_bar.setValue(100 * (position * progress["total"] + progress["done"])
+                                       // (len(ALGORITHMS) * progress["total"]))
+        update_bars(self.canvas.figure.axes[0], [progress["faults"]], bars=[position])
+        self.canvas.draw_idle()
 
     def display_results(self, results):
-        algorithms = list(results.keys())
-        page_faults = [results[algo][0] for algo in algorithms]
-        exec_times = [results[algo][1] for algo in algorithms]
-
-        fig, ax1 = plt.subplots()
-
-        ax1.bar(algorithms, page_faults, color='c', alpha=0.7, label='Page Faults')
-        ax1.set_xlabel("Paging Algorithms", fontsize=14)
-        ax1.set_ylabel("Page Faults", color='c', fontsize=14)
-        ax1.tick_params(axis='y', labelcolor='c')
-
-        ax2 = ax1.twinx()
-        ax2.plot(algorithms, exec_times, color='r', marker='o', linestyle='-', linewidth=2, label='Execution Time')
-        ax2.set_ylabel("Execution Time (seconds)", color='r', fontsize=14)
-        ax2.tick_params(axis='y', labelcolor='r')
-
-        plt.title("Page Faults & Execution Time Comparison", fontsize=16)
-        plt.grid(True)
-        plt.show()
+        self.progress_bar.setValue(100)
+        self.show_canvas(self.paging_system.create_visualization(results))
+
+    def show_canvas(self, fig):
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas  # Loaded with the first chart
+
+        if self.canvas is not None:
+            self.layout.removeWidget(self.canvas)
+            self.canvas.deleteLater()
+        self.canvas = FigureCanvas(fig)
+        self.layout.addWidget(self.canvas)
+        self.canvas.draw()
@@ -0,0 +1,372 @@
+from collections import OrderedDict, deque
+from heapq import heapify, heappop, heappush
+
+from .trace import next_use_index
+
+# Maps policy names to ReplacementPolicy subclasses
+POLICIES = {}
+
+
+def register_policy(name):
+    """Class decorator that adds a policy to the registry under `name`."""
+    def decorator(cls):
+        cls.name = name
+        POLICIES[name] = cls
+        return cls
+    return decorator
+
+
+def create_policy(name, num_frames):
+    """Returns a fresh instance of the registered policy."""
+    if name not in POLICIES:
+        raise ValueError(f"Unknown replacement policy: {name}")
+    return POLICIES[name](num_frames)
+
+
+def available_policies():
+    """Returns the names of all registered policies."""
+    return list(POLICIES)
+
+
+class ReplacementPolicy:
+    """Interface shared by the paging and virtual memory simulators.
+
+    The simulator owns the set of resident pages and calls the policy on
+    every access: `on_hit` for a resident page, and on a fault
+    `choose_victim` (only when every frame is in use) followed by
+    `on_miss` once the page is loaded. If the eviction then cannot go
+    ahead, `restore` puts the victim back. Pages are opaque hashable keys,
+    normally `(process_id, page_number)`.
+    """
+
+    name = None
+    needs_lookahead = False  # True if prepare() must see the trace before the run
+
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+
+    def prepare(self, requests):
+        """Gives lookahead policies the whole request sequence before the run."""
+
+    def on_hit(self, key):
+        """Called when `key` is already resident."""
+
+    def on_miss(self, key):
+        """Called after `key` has been loaded into a frame."""
+
+    def choose_victim(self, key):
+        """Returns the resident page to evict so that `key` can be loaded."""
+        raise NotImplementedError
+
+    def restore(self, victim):
+        """Undoes the last `choose_victim`, which returned `victim`, as if it had not been called.
+
+        The registered policies undo it exactly; this default only hands the
+        victim back as if it had just been loaded.
+        """
+        self.on_miss(victim)
+
+
+@register_policy("FIFO")
+class FIFOPolicy(ReplacementPolicy):
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.queue = deque()
+
+    def on_miss(self, key):
+        self.queue.append(key)
+
+    def choose_victim(self, key):
+        return self.queue.popleft()
+
+    def restore(self, victim):
+        self.queue.appendleft(victim)
+
+
+@register_policy("LRU")
+class LRUPolicy(ReplacementPolicy):
+    """Hash map with linked order; least recently used page first."""
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.order = OrderedDict()
+
+    def on_hit(self, key):
+        self.order.move_to_end(key)
+
+    def on_miss(self, key):
+        self.order[key] = None
+
+    def choose_victim(self, key):
+        return self.order.popitem(last=False)[0]
+
+    def restore(self, victim):
+        self.order[victim] = None
+        self.order.move_to_end(victim, last=False)
+
+
+@register_policy("Optimal")
+class OptimalPolicy(ReplacementPolicy):
+    """Belady's algorithm: evicts the page whose next use is furthest away.
+
+    Next-use positions come from one backward pass in `prepare`; a max-heap
+    keyed by next use gives O(log n) victim selection, with stale entries
+    skipped lazily. Stale entries sink (their next use has passed), so the
+    heap is rebuilt from the resident pages once it holds more than twice
+    as many entries, keeping it O(frames) instead of O(trace).
+    """
+
+    needs_lookahead = True
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.next_use = []
+        self.position = 0
+        self.resident = {}  # key -> position of its next use
+        self.heap = []
+        self._victim_next_use = None
+
+    def prepare(self, requests):
+        self.next_use = next_use_index(requests)
+        self.position = 0
+
+    def _touch(self, key):
+        next_use = self.next_use[self.position]
+        self.resident[key] = next_use
+        heappush(self.heap, (-next_use, key))
+        self.position += 1
+        if len(self.heap) > 2 * len(self.resident):
+            self.heap = [(-position, resident) for resident, position in self.resident.items()]
+            heapify(self.heap)
+
+    on_hit = _touch
+    on_miss = _touch
+
+    def choose_victim(self, key):
+        while True:
+            neg_next, victim = heappop(self.heap)
+            if self.resident.get(victim) == -neg_next:
+                del self.resident[victim]
+                self._victim_next_use = -neg_next
+                return victim
+
+    def restore(self, victim):
+        self.resident[victim] = self._victim_next_use
+        heappush(self.heap, (-self._victim_next_use, victim))
+
+
+@register_policy("CLOCK")
+class ClockPolicy(ReplacementPolicy):
+    """Second-chance replacement over a circular buffer of frames with reference bits."""
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.slots = []
+        self.referenced = []
+        self.slot_of = {}
+        self.hand = 0
+        self.free_slot = None
+        self._undo = None  # (hand, reference bits cleared, free slot) before the last choose_victim
+
+    def on_hit(self, key):
+        self.referenced[self.slot_of[key]] = True
+
+    def on_miss(self, key):
+        if self.free_slot is None:
+            slot = len(self.slots)
+            self.slots.append(key)
+            self.referenced.append(True)
+        else:
+            slot = self.free_slot
+            self.free_slot = None
+            self.slots[slot] = key
+            self.referenced[slot] = True
+            self.hand = (slot + 1) % len(self.slots)
+        self.slot_of[key] = slot
+
+    def choose_victim(self, key):
+        referenced = self.referenced
+        hand = self.hand
+        cleared = 0
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % len(referenced)
+            cleared += 1
+        self._undo = (self.hand, cleared, self.free_slot)
+        victim = self.slots[hand]
+        del self.slot_of[victim]
+        self.free_slot = self.hand = hand
+        return victim
+
+    def restore(self, victim):
+        hand, cleared, free_slot = self._undo
+        for step in range(cleared):
+            self.referenced[(hand + step) % len(self.referenced)] = True
+        self.slot_of[victim] = self.hand
+        self.hand = hand
+        self.free_slot = free_slot
+
+
+@register_policy("LFU")
+class LFUPolicy(ReplacementPolicy):
+    """Least frequently used with O(1) frequency buckets; ties go to the least recently used."""
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.frequency = {}
+        self.buckets = {}  # frequency -> OrderedDict of keys, oldest first
+        self.min_frequency = 0
+
+    def on_hit(self, key):
+        count = self.frequency[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_frequency == count:
+                self.min_frequency = count + 1
+        self.frequency[key] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def on_miss(self, key):
+        self.frequency[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_frequency = 1
+
+    def choose_victim(self, key):
+        bucket = self.buckets[self.min_frequency]
+        victim = bucket.popitem(last=False)[0]
+        if not bucket:
+            del self.buckets[self.min_frequency]
+        del self.frequency[victim]
+        return victim
+
+    def restore(self, victim):
+        # choose_victim leaves min_frequency alone, so it still names the victim's bucket
+        self.frequency[victim] = self.min_frequency
+        bucket = self.buckets.setdefault(self.min_frequency, OrderedDict())
+        bucket[victim] = None
+        bucket.move_to_end(victim, last=False)
+
+
+@register_policy("2Q")
+class TwoQueuePolicy(ReplacementPolicy):
+    """Full 2Q (Johnson & Shasha): a FIFO for first references, a ghost FIFO and a main LRU."""
+
+    def __init__(self, num_frames, in_ratio=0.25, out_ratio=0.5):
+        super().__init__(num_frames)
+        self.in_size = max(1, int(num_frames * in_ratio))
+        self.out_size = max(1, int(num_frames * out_ratio))
+        self.a1_in = OrderedDict()
+        self.a1_out = OrderedDict()  # Ghost entries: recently evicted from a1_in, not resident
+        self.am = OrderedDict()
+
+    def on_hit(self, key):
+        if key in self.am:
+            self.am.move_to_end(key)
+
+    def on_miss(self, key):
+        if key in self.a1_out:
+            del self.a1_out[key]
+            self.am[key] = None
+        else:
+            self.a1_in[key] = None
+        # Trimmed here rather than on eviction so the incoming page's ghost entry survives
+        while len(self.a1_out) > self.out_size:
+            self.a1_out.popitem(last=False)
+
+    def choose_victim(self, key):
+        if self.a1_in and (len(self.a1_in) > self.in_size or not self.am):
+            victim = self.a1_in.popitem(last=False)[0]
+            self.a1_out[victim] = None
+            return victim
+        return self.am.popitem(last=False)[0]
+
+    def restore(self, victim):
+        if victim in self.a1_out:
+            del self.a1_out[victim]
+            queue = self.a1_in
+        else:
+            queue = self.am
+        queue[victim] = None
+        queue.move_to_end(victim, last=False)
+
+
+@register_policy("ARC")
+class ARCPolicy(ReplacementPolicy):
+    """Adaptive Replacement Cache (Megiddo & Modha).
+
+    T1/T2 hold resident pages seen once/more than once, B1/B2 are their
+    ghost lists, and the target size `p` of T1 adapts on ghost hits.
+    """
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.p = 0.0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self._undo = None  # (p, ghost list and key dropped) before the last choose_victim
+
+    def on_hit(self, key):
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+        self.t2[key] = None
+
+    def on_miss(self, key):
+        if key in self.b1:
+            del self.b1[key]
+            self.t2[key] = None
+        elif key in self.b2:
+            del self.b2[key]
+            self.t2[key] = None
+        else:
+            self.t1[key] = None
+
+    def _replace(self, key):
+        if self.t1 and (len(self.t1) > self.p or (key in self.b2 and len(self.t1) == self.p) or not self.t2):
+            victim = self.t1.popitem(last=False)[0]
+            self.b1[victim] = None
+        else:
+            victim = self.t2.popitem(last=False)[0]
+            self.b2[victim] = None
+        return victim
+
+    def choose_victim(self, key):
+        self._undo = (self.p, None)
+        c = self.num_frames
+        if key in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) / len(self.b1), 1))
+            return self._replace(key)
+        if key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) / len(self.b2), 1))
+            return self._replace(key)
+
+        if len(self.t1) + len(self.b1) >= c:
+            if len(self.t1) < c:
+                self._undo = (self.p, (self.b1, self.b1.popitem(last=False)[0]))
+                return self._replace(key)
+            return self.t1.popitem(last=False)[0]
+        if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * c:
+            self._undo = (self.p, (self.b2, self.b2.popitem(last=False)[0]))
+        return self._replace(key)
+
+    def restore(self, victim):
+        self.p, dropped = self._undo
+        if victim in self.b1:
+            del self.b1[victim]
+            resident = self.t1
+        elif victim in self.b2:
+            del self.b2[victim]
+            resident = self.t2
+        else:
+            resident = self.t1
+        resident[victim] = None
+        resident.move_to_end(victim, last=False)
+        if dropped is not None:
+            ghosts, ghost = dropped
+            ghosts[ghost] = None
+            ghosts.move_to_end(ghost, last=False)
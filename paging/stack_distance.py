@@ -0,0 +1,114 @@
+from .trace import next_use_index
+
+
+class _FenwickTree:
+    """Binary indexed tree over trace positions, used to count distinct pages between reuses."""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        """Sum of positions [0, index)."""
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+
+def lru_stack_distances(page_requests):
+    """Returns the LRU stack distance of every request (None for a first reference).
+
+    The distance is the number of distinct pages touched since the previous
+    reference to the same page, plus one; a request hits in an LRU memory of
+    `c` frames exactly when its distance is at most `c`.
+    """
+    tree = _FenwickTree(len(page_requests))
+    last_seen = {}
+    distances = []
+    for i, key in enumerate(page_requests):
+        previous = last_seen.get(key)
+        if previous is None:
+            distances.append(None)
+        else:
+            # Each page has a single marker at its latest position
+            distances.append(tree.prefix_sum(i) - tree.prefix_sum(previous + 1) + 1)
+            tree.add(previous, -1)
+        tree.add(i, 1)
+        last_seen[key] = i
+    return distances
+
+
+def optimal_stack_distances(page_requests):
+    """Returns the OPT (Belady) stack distance of every request (None for a first reference).
+
+    Uses Mattson's priority stack update, where the priority of a page is its
+    next-use position. Each request costs O(depth of the referenced page).
+    """
+    next_use = next_use_index(page_requests)
+    stack = []
+    priority = {}  # page -> position of its next use
+    distances = []
+    for i, key in enumerate(page_requests):
+        if key in priority:
+            depth = stack.index(key)
+            distances.append(depth + 1)
+        else:
+            depth = len(stack)
+            stack.append(key)
+            distances.append(None)
+        priority[key] = next_use[i]
+
+        # Move the referenced page to the top, pushing the page with the later
+        # next use down at each level until the vacated slot is filled.
+        if depth:
+            carried = stack[0]
+            stack[0] = key
+            for level in range(1, depth):
+                resident = stack[level]
+                if priority[resident] > priority[carried]:
+                    stack[level], carried = carried, resident
+            stack[depth] = carried
+    return distances
+
+
+STACK_ALGORITHMS = {
+    "LRU": lru_stack_distances,
+    "Optimal": optimal_stack_distances,
+}
+
+
+def fault_curve(page_requests, algorithm="LRU", max_frames=None):
+    """Returns page fault counts for every frame count from one pass over the trace.
+
+    The result is a list where index `c` holds the number of faults with `c`
+    frames of global replacement, for `c` from 0 up to `max_frames` (default:
+    the number of distinct pages, past which the count no longer changes).
+    """
+    if algorithm not in STACK_ALGORITHMS:
+        raise ValueError(f"{algorithm} is not a stack algorithm")
+
+    distances = STACK_ALGORITHMS[algorithm](page_requests)
+    cold_misses = sum(1 for distance in distances if distance is None)
+    if max_frames is None:
+        max_frames = cold_misses
+
+    histogram = [0] * (max_frames + 2)
+    for distance in distances:
+        if distance is not None:
+            histogram[min(distance, max_frames + 1)] += 1
+
+    # Faults with c frames are cold misses plus every reuse deeper than c
+    faults = [0] * (max_frames + 1)
+    deeper = sum(histogram)
+    for frames in range(max_frames + 1):
+        deeper -= histogram[frames]
+        faults[frames] = cold_misses + deeper
+    return faults
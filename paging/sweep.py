@@ -0,0 +1,76 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+
+from .paging import PagingSystem
+from .trace import PageTrace
+
+# Per-worker view of the shared trace, set up once by _attach_trace
+_shared = {}
+
+
+def _attach_trace(name, count):
+    """Worker initializer: maps the shared trace without copying it."""
+    shm = shared_memory.SharedMemory(name=name)
+    _shared["shm"] = shm
+    _shared["addresses"] = shm.buf[:count * 8].cast("q")
+    _shared["process_ids"] = shm.buf[count * 8:count * 12].cast("i")
+    _shared["traces"] = {}
+
+
+def _trace_for(page_size):
+    """Returns the page trace for a page size, converting the shared addresses once per worker."""
+    traces = _shared["traces"]
+    if page_size not in traces:
+        trace = PageTrace(page_size)
+        trace.process_ids = _shared["process_ids"]
+        trace.page_numbers = array("i", map(page_size.__rfloordiv__, _shared["addresses"]))
+        traces[page_size] = trace
+    return traces[page_size]
+
+
+def _run_config(algorithm, num_frames, page_size):
+    """Runs one configuration on its own PagingSystem."""
+    paging_system = PagingSystem(0, page_size, num_frames)
+    paging_system.page_requests = _trace_for(page_size)
+    page_faults, exec_time = paging_system.simulate_algorithm(algorithm)
+    return {
+        "algorithm": algorithm,
+        "num_frames": num_frames,
+        "page_size": page_size,
+        "page_faults": page_faults,
+        "exec_time": exec_time,
+    }
+
+
+def run_sweep(requests, algorithms, frame_counts, page_sizes, max_workers=None):
+    """Runs every (algorithm, frames, page_size) combination in parallel.
+
+    `requests` is an iterable of (process_id, logical_address) pairs. The
+    trace is placed in shared memory once and mapped by every worker, and
+    each combination gets a fresh PagingSystem, so runs cannot affect each
+    other. Results are returned in combination order.
+    """
+    addresses = array("q")
+    process_ids = array("i")
+    for process_id, logical_address in requests:
+        process_ids.append(process_id)
+        addresses.append(logical_address)
+    count = len(addresses)
+
+    configs = list(product(algorithms, frame_counts, page_sizes))
+    shm = shared_memory.SharedMemory(create=True, size=max(count * 12, 1))
+    try:
+        shm.buf[:count * 8] = addresses.tobytes()
+        shm.buf[count * 8:count * 12] = process_ids.tobytes()
+        del addresses, process_ids
+
+        workers = min(max_workers or os.cpu_count() or 1, max(len(configs), 1))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_trace,
+                                 initargs=(shm.name, count)) as executor:
+            return list(executor.map(_run_config, *zip(*configs))) if configs else []
+    finally:
+        shm.close()
+        shm.unlink()
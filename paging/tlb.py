@@ -0,0 +1,97 @@
+import random
+from collections import OrderedDict
+
+
+class TLB:
+    """Set-associative translation lookaside buffer in front of the page table.
+
+    Entries are `(process_id, page)` keys, so translations of different
+    processes can coexist (ASID tagging). With `flush_on_context_switch`
+    the TLB behaves like an untagged one instead and is emptied whenever the
+    running process changes. Each set is an OrderedDict, which gives O(1)
+    lookup, LRU/FIFO update and invalidation.
+    """
+
+    REPLACEMENT_POLICIES = ("LRU", "FIFO", "Random")
+
+    def __init__(self, entries=64, associativity=4, policy="LRU", flush_on_context_switch=False, seed=0):
+        if policy not in self.REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown TLB replacement policy: {policy}")
+        if entries <= 0 or associativity <= 0 or entries % associativity:
+            raise ValueError("TLB entries must be a positive multiple of the associativity")
+        self.entries = entries
+        self.associativity = associativity
+        self.num_sets = entries // associativity
+        self.policy = policy
+        self.flush_on_context_switch = flush_on_context_switch
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        """Empties the TLB and clears its counters."""
+        self.sets = [OrderedDict() for _ in range(self.num_sets)]
+        self.random = random.Random(self.seed)
+        self.current_process = None
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def lookup(self, key):
+        """Looks up a (process_id, page) translation, filling it after a page walk on a miss.
+
+        Returns True on a TLB hit.
+        """
+        if self.flush_on_context_switch and key[0] != self.current_process:
+            if self.current_process is not None:
+                self.flush()
+            self.current_process = key[0]
+
+        entries = self.sets[key[1] % self.num_sets]
+        if key in entries:
+            self.hits += 1
+            if self.policy == "LRU":
+                entries.move_to_end(key)
+            return True
+
+        self.misses += 1
+        if len(entries) >= self.associativity:
+            if self.policy == "Random":
+                del entries[self.random.choice(list(entries))]
+            else:
+                entries.popitem(last=False)
+        entries[key] = None
+        return False
+
+    def invalidate(self, key):
+        """Drops the translation for a page that is no longer resident."""
+        self.sets[key[1] % self.num_sets].pop(key, None)
+
+    def flush(self, process_id=None):
+        """Empties the whole TLB, or only the entries of one process."""
+        self.flushes += 1
+        for entries in self.sets:
+            if process_id is None:
+                entries.clear()
+            else:
+                for key in [key for key in entries if key[0] == process_id]:
+                    del entries[key]
+
+    def report(self, page_faults=0, tlb_latency=1.0, memory_latency=100.0, walk_levels=4, fault_latency=0.0):
+        """Returns hit/miss counts and the effective memory access time.
+
+        Latencies share one unit (e.g. nanoseconds). Every access pays a TLB
+        lookup and one memory access; each miss adds a page walk of
+        `walk_levels` memory accesses, and each page fault adds `fault_latency`.
+        """
+        accesses = self.hits + self.misses
+        total_time = (accesses * (tlb_latency + memory_latency)
+                      + self.misses * walk_levels * memory_latency
+                      + page_faults * fault_latency)
+        return {
+            "tlb_hits": self.hits,
+            "tlb_misses": self.misses,
+            "page_walks": self.misses,
+            "flushes": self.flushes,
+            "hit_ratio": self.hits / accesses if accesses else 0.0,
+            "effective_access_time": total_time / accesses if accesses else 0.0,
+        }
@@ -0,0 +1,235 @@
+import mmap
+import struct
+from array import array
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:  # add_addresses falls back to map() over the addresses
+    np = None
+
+
+class PageTrace:
+    """Columnar page request trace backed by contiguous int arrays.
+
+    Process IDs and page numbers are kept in two `array('i')` columns, so a
+    request costs 8 bytes instead of a tuple and two int objects. Iterating
+    or indexing yields `(process_id, page_number)` pairs, which lets the
+    paging engines consume a trace and a plain list of tuples alike.
+    """
+
+    __slots__ = ("page_size", "process_ids", "page_numbers")
+
+    def __init__(self, page_size, requests=()):
+        if page_size <= 0:
+            raise ValueError("Page size must be positive")
+        self.page_size = page_size
+        self.process_ids = array("i")
+        self.page_numbers = array("i")
+        self.extend(requests)
+
+    def __len__(self):
+        return len(self.page_numbers)
+
+    def __iter__(self):
+        return zip(self.process_ids, self.page_numbers)
+
+    def __getitem__(self, index):
+        return self.process_ids[index], self.page_numbers[index]
+
+    def append(self, process_id, page_number):
+        """Adds a single (process_id, page_number) request."""
+        self.extend(((process_id, page_number),))
+
+    def extend(self, requests):
+        """Adds (process_id, page_number) pairs; on error the trace is left as it was."""
+        start = len(self.page_numbers)
+        try:
+            for process_id, page_number in requests:
+                self.process_ids.append(process_id)
+                self.page_numbers.append(page_number)
+        except BaseException:
+            self._truncate(start)
+            raise
+
+    def _truncate(self, length):
+        del self.process_ids[length:]
+        del self.page_numbers[length:]
+
+    def add_addresses(self, process_ids, logical_addresses):
+        """Bulk-adds logical addresses, converting them to page numbers.
+
+        `process_ids` is either one ID shared by every address or an iterable
+        aligned with `logical_addresses`. With NumPy the division is
+        vectorized over the whole batch and each column grows by one copy of
+        raw bytes; otherwise the page numbers are computed through map().
+        If either column fails to convert, both are truncated back, so the
+        trace is left as it was.
+        """
+        start = len(self.page_numbers)
+        try:
+            if np is None:
+                self.page_numbers.extend(map(self.page_size.__rfloordiv__, logical_addresses))
+            else:
+                self.page_numbers.frombytes(_column_bytes(_int_vector(logical_addresses) // self.page_size,
+                                                          self.page_numbers))
+            if isinstance(process_ids, int):
+                self.process_ids.extend(repeat(process_ids, len(self.page_numbers) - start))
+            elif np is None:
+                self.process_ids.extend(process_ids)
+            else:
+                self.process_ids.frombytes(_column_bytes(_int_vector(process_ids), self.process_ids))
+            if len(self.process_ids) != len(self.page_numbers):
+                raise ValueError("process_ids and logical_addresses must have the same length")
+        except BaseException:
+            self._truncate(start)
+            raise
+
+    def nbytes(self):
+        """Returns the memory used by the two columns."""
+        return (len(self.process_ids) * self.process_ids.itemsize
+                + len(self.page_numbers) * self.page_numbers.itemsize)
+
+
+def _int_vector(values):
+    vector = np.asarray(values) if hasattr(values, "__len__") else np.fromiter(values, dtype=np.int64)
+    if vector.size and vector.dtype.kind not in "iu":
+        raise TypeError("process IDs and logical addresses must be integers")
+    return vector
+
+
+def _column_bytes(vector, column):
+    """Returns an int vector as raw bytes for `column`, raising OverflowError like array.extend would."""
+    dtype = np.dtype(f"i{column.itemsize}")
+    limits = np.iinfo(dtype)
+    if vector.size and (vector.min() < limits.min or vector.max() > limits.max):
+        raise OverflowError(f"value out of range for array('{column.typecode}')")
+    return vector.astype(dtype).tobytes()
+
+
+def next_use_index(page_requests):
+    """Returns the position of each request's next use, or len(page_requests) if never used again.
+
+    The positions are an array('q'), 8 bytes per request instead of an int object each.
+    """
+    never = len(page_requests)
+    next_use = array("q", [never]) * never
+    last_seen = {}
+    for i in range(never - 1, -1, -1):
+        key = page_requests[i]
+        next_use[i] = last_seen.get(key, never)
+        last_seen[key] = i
+    return next_use
+
+
+# Binary trace format: a fixed header followed by fixed-width records of
+# (process_id: int32, logical_address: uint64), all little-endian.
+TRACE_MAGIC = b"MMTR"
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct("<4sHHIIQ")  # magic, version, reserved, page_size, process_count, record_count
+TRACE_RECORD = struct.Struct("<iQ")
+
+
+def write_trace_file(path, requests, page_size, chunk_records=65536):
+    """Writes (process_id, logical_address) pairs to a binary trace file, streaming in chunks."""
+    process_ids = set()
+    record_count = 0
+    with open(path, "wb") as f:
+        f.write(bytes(TRACE_HEADER.size))  # Filled in once the counts are known
+        chunk = bytearray()
+        for process_id, logical_address in requests:
+            process_ids.add(process_id)
+            chunk += TRACE_RECORD.pack(process_id, logical_address)
+            record_count += 1
+            if record_count % chunk_records == 0:
+                f.write(chunk)
+                chunk.clear()
+        f.write(chunk)
+        f.seek(0)
+        f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, page_size, len(process_ids), record_count))
+    return record_count
+
+
+class TraceFile:
+    """Memory-mapped, read-only view of a binary trace file.
+
+    Behaves like a sequence of `(process_id, page_number)` pairs, converting
+    logical addresses with the page size stored in the header. Iteration
+    decodes the file in fixed-size chunks, so memory use does not grow with
+    the trace length.
+    """
+
+    def __init__(self, path, chunk_records=65536):
+        self.path = path
+        self.chunk_records = chunk_records
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a trace file")
+
+        if len(self._map) < TRACE_HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a trace file")
+        magic, version, _, self.page_size, self.process_count, self.record_count = TRACE_HEADER.unpack_from(self._map, 0)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} trace file")
+        if len(self._map) < TRACE_HEADER.size + self.record_count * TRACE_RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmaps the file and closes it; closing twice is harmless."""
+        self._map.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.record_count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.record_count
+        if not 0 <= index < self.record_count:
+            raise IndexError("trace index out of range")
+        process_id, logical_address = TRACE_RECORD.unpack_from(self._map, TRACE_HEADER.size + index * TRACE_RECORD.size)
+        return process_id, logical_address // self.page_size
+
+    def iter_chunks(self):
+        """Yields lists of (process_id, page_number) pairs, chunk_records at a time."""
+        page_size = self.page_size
+        end = TRACE_HEADER.size + self.record_count * TRACE_RECORD.size
+        step = self.chunk_records * TRACE_RECORD.size
+        for start in range(TRACE_HEADER.size, end, step):
+            records = TRACE_RECORD.iter_unpack(self._map[start:min(start + step, end)])
+            yield [(process_id, logical_address // page_size) for process_id, logical_address in records]
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def with_data(self, data="data"):
+        """Returns a re-iterable view of (process_id, page_number, data) triples for VirtualMemorySystem."""
+        return _TraceWithData(self, data)
+
+
+class _TraceWithData:
+    def __init__(self, trace, data):
+        self.trace = trace
+        self.data = data
+
+    def __len__(self):
+        return len(self.trace)
+
+    def __iter__(self):
+        data = self.data
+        for chunk in self.trace.iter_chunks():
+            for process_id, page_number in chunk:
+                yield process_id, page_number, data
@@ -0,0 +1,211 @@
+import random
+import time
+from bisect import bisect_left, insort
+
+from .treap import Node, in_order, insert, remove
+
+STRATEGIES = ("first_fit", "best_fit", "worst_fit", "next_fit")
+
+
+def _first_fit(node, size, lowest_start):
+    """Returns the lowest-addressed hole at or after lowest_start with at least `size` bytes."""
+    if node is None or node.max_value < size:
+        return None
+    if node.order < lowest_start:
+        return _first_fit(node.right, size, lowest_start)
+    found = _first_fit(node.left, size, lowest_start)
+    if found is not None:
+        return found
+    if node.value >= size:
+        return node
+    return _first_fit(node.right, size, lowest_start)
+
+
+class MemoryAllocator:
+    """Places variable-sized blocks in a fixed physical memory.
+
+    Free holes live in a treap of nodes ordered by start address with their
+    size as value (so augmented with the largest hole per subtree) for first-fit, next-fit and coalescing, and in a list
+    sorted by (size, start) for best-fit and worst-fit. Placement and freeing
+    are logarithmic searches; adjacent holes are coalesced on free.
+    """
+
+    def __init__(self, memory_size, strategy="first_fit", seed=0):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown placement strategy: {strategy}")
+        self.memory_size = memory_size
+        self.strategy = strategy
+        self.random = random.Random(seed)
+        self.root = None
+        self.by_size = []  # Sorted (size, start) pairs
+        self.blocks = {}  # base -> (size, owner)
+        self.allocated = 0
+        self.next_start = 0  # Where next-fit resumes its search
+        self.allocations = 0
+        self.failures = 0
+        if memory_size > 0:
+            self._add_hole(0, memory_size)
+
+    def _add_hole(self, start, size):
+        self.root = insert(self.root, Node(start, size, self.random.random()))
+        insort(self.by_size, (size, start))
+
+    def _remove_hole(self, start, size):
+        self.root = remove(self.root, start)
+        del self.by_size[bisect_left(self.by_size, (size, start))]
+
+    def _hole_before(self, address):
+        """Returns the hole with the greatest start <= address, or None."""
+        node, best = self.root, None
+        while node is not None:
+            if node.order <= address:
+                best, node = node, node.right
+            else:
+                node = node.left
+        return best
+
+    def _find_hole(self, size):
+        if self.strategy == "first_fit":
+            hole = _first_fit(self.root, size, 0)
+            return (hole.order, hole.value) if hole else None
+        if self.strategy == "next_fit":
+            hole = _first_fit(self.root, size, self.next_start) or _first_fit(self.root, size, 0)
+            return (hole.order, hole.value) if hole else None
+        if self.strategy == "best_fit":
+            index = bisect_left(self.by_size, (size, -1))
+            return self.by_size[index][::-1] if index < len(self.by_size) else None
+        # worst_fit
+        if self.by_size and self.by_size[-1][0] >= size:
+            return self.by_size[-1][::-1]
+        return None
+
+    def allocate(self, size, owner=None):
+        """Places a block of `size` bytes and returns its base, or None if no hole is large enough."""
+        if size <= 0:
+            raise ValueError("Block size must be positive")
+        hole = self._find_hole(size)
+        if hole is None:
+            self.failures += 1
+            return None
+        start, hole_size = hole
+        self._remove_hole(start, hole_size)
+        if hole_size > size:
+            self._add_hole(start + size, hole_size - size)
+        self._record(start, size, owner)
+        self.next_start = start + size
+        return start
+
+    def reserve(self, base, size, owner=None):
+        """Claims the exact range [base, base + size), which must lie inside one hole."""
+        if size <= 0:
+            raise ValueError("Block size must be positive")
+        hole = self._hole_before(base)
+        if hole is None or hole.order + hole.value < base + size:
+            raise ValueError(f"Range {base}-{base + size - 1} overlaps allocated memory or lies outside it")
+        start, hole_size = hole.order, hole.value
+        self._remove_hole(start, hole_size)
+        if base > start:
+            self._add_hole(start, base - start)
+        if start + hole_size > base + size:
+            self._add_hole(base + size, start + hole_size - base - size)
+        self._record(base, size, owner)
+        return base
+
+    def _record(self, base, size, owner):
+        self.blocks[base] = (size, owner)
+        self.allocated += size
+        self.allocations += 1
+
+    def free(self, base):
+        """Frees the block at `base`, coalescing it with neighbouring holes."""
+        size, _ = self.blocks.pop(base)
+        self.allocated -= size
+        start, end = base, base + size
+
+        before = self._hole_before(base)
+        if before is not None and before.order + before.value == base:
+            start = before.order
+            self._remove_hole(before.order, before.value)
+        after = self._hole_before(end)
+        if after is not None and after.order == end:
+            end += after.value
+            self._remove_hole(after.order, after.value)
+        self._add_hole(start, end - start)
+
+    def compact(self):
+        """Slides every block down to the lowest addresses, leaving one hole at the top.
+
+        Returns (moves, bytes_moved), where moves lists (owner, old_base, new_base)
+        for every block that changed place.
+        """
+        moves = []
+        bytes_moved = 0
+        blocks = {}
+        address = 0
+        for base in sorted(self.blocks):
+            size, owner = self.blocks[base]
+            if base != address:
+                moves.append((owner, base, address))
+                bytes_moved += size
+            blocks[address] = (size, owner)
+            address += size
+
+        self.blocks = blocks
+        self.root = None
+        self.by_size = []
+        if address < self.memory_size:
+            self._add_hole(address, self.memory_size - address)
+        self.next_start = address
+        return moves, bytes_moved
+
+    def holes(self):
+        """Returns the free holes as (start, size) pairs in address order."""
+        return [(node.order, node.value) for node in in_order(self.root)]
+
+    def stats(self):
+        """Returns utilization and external fragmentation metrics."""
+        free = self.memory_size - self.allocated
+        largest_hole = self.by_size[-1][0] if self.by_size else 0
+        return {
+            "memory_size": self.memory_size,
+            "allocated": self.allocated,
+            "free": free,
+            "utilization": self.allocated / self.memory_size if self.memory_size else 0.0,
+            "hole_count": len(self.by_size),
+            "largest_hole": largest_hole,
+            # Share of free memory unusable for a request as large as all free memory
+            "external_fragmentation": 1 - largest_hole / free if free else 0.0,
+            "allocations": self.allocations,
+            "failures": self.failures,
+        }
+
+
+def replay_allocation_trace(events, memory_size, strategy="first_fit"):
+    """Replays ("alloc", block_id, size) and ("free", block_id) events with one strategy.
+
+    Returns the final fragmentation metrics plus the run time and the average
+    utilization sampled after every event.
+    """
+    allocator = MemoryAllocator(memory_size, strategy)
+    bases = {}
+    utilization_sum = 0.0
+    start_time = time.perf_counter()
+    for event in events:
+        if event[0] == "alloc":
+            base = allocator.allocate(event[2], event[1])
+            if base is not None:
+                bases[event[1]] = base
+        elif event[1] in bases:
+            allocator.free(bases.pop(event[1]))
+        utilization_sum += allocator.allocated
+    exec_time = time.perf_counter() - start_time
+
+    report = allocator.stats()
+    report["exec_time"] = exec_time
+    report["average_utilization"] = utilization_sum / len(events) / memory_size if events and memory_size else 0.0
+    return report
+
+
+def compare_strategies(events, memory_size, strategies=STRATEGIES):
+    """Replays the same allocation trace under each placement strategy."""
+    return {strategy: replay_allocation_trace(events, memory_size, strategy) for strategy in strategies}
@@ -0,0 +1,70 @@
+import random
+from itertools import count
+
+from .treap import Node, insert, remove
+
+
+class _Interval(Node):
+    """Treap node for a half-open interval [start, end), ordered by (start, sequence number).
+
+    The end is the node's value, so its `max_value` lets queries skip subtrees
+    that finish before the range of interest.
+    """
+
+    __slots__ = ("start", "key")
+
+    def __init__(self, order, start, end, key, priority):
+        super().__init__(order, end, priority)
+        self.start = start
+        self.key = key
+
+
+def _collect(node, start, end, found):
+    if node is None or node.max_value <= start:
+        return
+    _collect(node.left, start, end, found)
+    if node.start < end:
+        if node.value > start:
+            found.append(node.key)
+        _collect(node.right, start, end, found)
+
+
+class IntervalIndex:
+    """Interval tree over [start, end) ranges tagged with a key.
+
+    Insertions, removals and the search part of a query take O(log n)
+    expected time; a query then costs O(1) per reported interval.
+    """
+
+    def __init__(self, seed=0):
+        self.root = None
+        self.random = random.Random(seed)
+        self.sequence = count()
+        self.orders = {}  # key -> (start, sequence number), used to find its node again
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, key):
+        return key in self.orders
+
+    def add(self, key, start, end):
+        """Indexes [start, end) under `key`, replacing any interval the key already had."""
+        if key in self.orders:
+            self.remove(key)
+        order = (start, next(self.sequence))
+        self.orders[key] = order
+        self.root = insert(self.root, _Interval(order, start, end, key, self.random.random()))
+
+    def remove(self, key):
+        self.root = remove(self.root, self.orders.pop(key))
+
+    def overlapping(self, start, end):
+        """Returns the keys of every interval intersecting [start, end), in start order."""
+        found = []
+        _collect(self.root, start, end, found)
+        return found
+
+    def containing(self, point):
+        """Returns the keys of every interval that contains `point`."""
+        return self.overlapping(point, point + 1)
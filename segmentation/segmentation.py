@@ -1,37 +1,147 @@
-from PyQt6.QtCore import QObject, pyqtSignal
-import matplotlib.pyplot as plt
+from array import array
+
+from events.observable import Observable
+from .allocator import MemoryAllocator
+from .interval_index import IntervalIndex
+
+try:
+    import numpy as np
+except ImportError:  # translate_batch falls back to a plain loop over array columns
+    np = None
+
+# Status codes returned by translate_batch
+TRANSLATION_SUCCESS = 0
+OFFSET_OUT_OF_BOUNDS = 1
+SEGMENT_NOT_FOUND = 2
+
+# Past these sizes the layout chart aggregates segments / drops per-segment labels
+DEFAULT_MAX_SEGMENTS = 1000
+DEFAULT_MAX_LABELS = 50
 
 class Segment:
+    __slots__ = ("segment_id", "base", "limit")
+
     def __init__(self, segment_id, base, limit):
         self.segment_id = segment_id
         self.base = base
         self.limit = limit
 
-class SegmentationSystem(QObject):
-    # PyQt6 Signals for GUI communication
-    translation_complete = pyqtSignal(dict)
-    allocation_complete = pyqtSignal(dict)
+class SegmentationSystem(Observable):
+    """Segment tables and address translation, with no GUI dependencies.
 
-    def __init__(self):
+    Observers receive "allocation_complete" and "translation_complete"
+    events with the same dicts the methods return.
+    """
+
+    def __init__(self, memory_size=None, strategy="first_fit"):
         super().__init__()
-        self.segment_table = {}  # Now handles multiple processes
+        self.segment_table = {}  # process_id -> {segment_id: Segment}
         self.translation_results = {"success": 0, "fault": 0}
+        self._table_view = None  # Cached get_segment_table() result, cleared on allocation
+        self._flat_table = None  # Cached base/limit arrays for translate_batch, cleared on allocation
+        # With a memory size, segments are placed in (and checked against) physical memory
+        self.allocator = MemoryAllocator(memory_size, strategy) if memory_size is not None else None
+        self.physical_index = IntervalIndex()  # Reverse map: physical range -> (process_id, segment_id)
 
-    def allocate_segment(self, process_id, segment_id, base, limit):
-        """Allocates segments for multiple processes."""
-        if process_id not in self.segment_table:
-            self.segment_table[process_id] = []
-        
-        self.segment_table[process_id].append(Segment(segment_id, base, limit))
-        
-        # Emit allocation result
-        self.allocation_complete.emit({
-            "process_id": process_id,
-            "segment_id": segment_id,
-            "base": base,
-            "limit": limit,
-            "status": "Allocated"
-        })
+    def allocate_segment(self, process_id, segment_id, base, limit, replace=False):
+        """Allocates segments for multiple processes.
+
+        Allocating a segment ID the process already has raises ValueError,
+        unless replace is True, in which case the old segment is replaced.
+        With a physical memory allocator, a segment overlapping allocated
+        memory also raises ValueError.
+        """
+        old = self._check_replace(process_id, segment_id, replace)
+        if self.allocator is not None:
+            try:
+                self.allocator.reserve(base, limit, (process_id, segment_id))
+            except ValueError:
+                self._restore(process_id, old)
+                raise
+        self._add_segment(process_id, segment_id, base, limit)
+
+    def place_segment(self, process_id, segment_id, limit, replace=False):
+        """Lets the allocator choose the base of a new segment and returns it.
+
+        Raises MemoryError when no hole is large enough.
+        """
+        if self.allocator is None:
+            raise ValueError("place_segment needs a SegmentationSystem created with a memory_size")
+        old = self._check_replace(process_id, segment_id, replace)
+        base = self.allocator.allocate(limit, (process_id, segment_id))
+        if base is None:
+            self._restore(process_id, old)
+            raise MemoryError(f"No hole of {limit} bytes for segment {segment_id} of process {process_id}")
+        self._add_segment(process_id, segment_id, base, limit)
+        return base
+
+    def free_segment(self, process_id, segment_id):
+        """Removes a segment and returns its memory to the allocator."""
+        segments = self.segment_table.get(process_id)
+        if not segments or segment_id not in segments:
+            raise ValueError(f"Segment {segment_id} is not allocated to process {process_id}")
+        segment = segments.pop(segment_id)
+        if not segments:
+            del self.segment_table[process_id]
+        self.physical_index.remove((process_id, segment_id))
+        if self.allocator is not None:
+            self.allocator.free(segment.base)
+        self._table_changed()
+        if self.observers:
+            self.notify("segment_freed", {"process_id": process_id, "segment_id": segment_id})
+
+    def compact(self):
+        """Moves every segment down to the lowest addresses and returns how much was moved."""
+        if self.allocator is None:
+            raise ValueError("compact needs a SegmentationSystem created with a memory_size")
+        moves, bytes_moved = self.allocator.compact()
+        for (process_id, segment_id), _, new_base in moves:
+            segment = self.segment_table[process_id][segment_id]
+            segment.base = new_base
+            self.physical_index.add((process_id, segment_id), new_base, new_base + segment.limit)
+        self._table_changed()
+        return {"moved_segments": len(moves), "bytes_moved": bytes_moved}
+
+    def memory_stats(self):
+        """Returns utilization, hole count, largest hole and fragmentation of physical memory."""
+        if self.allocator is None:
+            raise ValueError("memory_stats needs a SegmentationSystem created with a memory_size")
+        return self.allocator.stats()
+
+    def _check_replace(self, process_id, segment_id, replace):
+        """Rejects duplicate segment IDs; when replacing, frees and returns the old segment."""
+        old = self.segment_table.get(process_id, {}).get(segment_id)
+        if old is None:
+            return None
+        if not replace:
+            raise ValueError(f"Segment {segment_id} is already allocated to process {process_id}")
+        if self.allocator is not None:
+            self.allocator.free(old.base)
+        return old
+
+    def _restore(self, process_id, old):
+        """Gives a replaced segment its memory back after a failed replacement."""
+        if old is not None and self.allocator is not None:
+            self.allocator.reserve(old.base, old.limit, (process_id, old.segment_id))
+
+    def _add_segment(self, process_id, segment_id, base, limit):
+        self.segment_table.setdefault(process_id, {})[segment_id] = Segment(segment_id, base, limit)
+        self.physical_index.add((process_id, segment_id), base, base + limit)
+        self._table_changed()
+
+        # Notify allocation result
+        if self.observers:
+            self.notify("allocation_complete", {
+                "process_id": process_id,
+                "segment_id": segment_id,
+                "base": base,
+                "limit": limit,
+                "status": "Allocated"
+            })
+
+    def _table_changed(self):
+        self._table_view = None
+        self._flat_table = None
 
     def translate_address(self, process_id, segment_id, offset):
         """Translates addresses for multiple processes."""
@@ -43,65 +153,229 @@ class SegmentationSystem(QObject):
             "physical_address": None
         }
 
-        if process_id in self.segment_table:
-            for segment in self.segment_table[process_id]:
-                if segment.segment_id == segment_id:
-                    if 0 <= offset < segment.limit:
-                        physical_address = segment.base + offset
-                        self.translation_results["success"] += 1
-                        result.update({
-                            "status": "success",
-                            "physical_address": physical_address,
-                            "message": f"Physical Address: {physical_address}"
-                        })
-                        self.translation_complete.emit(result)
-                        return result
-                    else:
-                        self.translation_results["fault"] += 1
-                        result.update({
-                            "status": "fault",
-                            "message": "Segment Fault! Offset out of bounds."
-                        })
-                        self.translation_complete.emit(result)
-                        return result
+        segments = self.segment_table.get(process_id)
+        segment = segments.get(segment_id) if segments else None
+        if segment is not None:
+            if 0 <= offset < segment.limit:
+                physical_address = segment.base + offset
+                self.translation_results["success"] += 1
+                result.update({
+                    "status": "success",
+                    "physical_address": physical_address,
+                    "message": f"Physical Address: {physical_address}"
+                })
+                if self.observers:
+                    self.notify("translation_complete", result)
+                return result
+            else:
+                self.translation_results["fault"] += 1
+                result.update({
+                    "status": "fault",
+                    "message": "Segment Fault! Offset out of bounds."
+                })
+                if self.observers:
+                    self.notify("translation_complete", result)
+                return result
 
         self.translation_results["fault"] += 1
         result.update({
             "status": "fault",
             "message": "Segment Fault! Segment not found."
         })
-        self.translation_complete.emit(result)
+        if self.observers:
+            self.notify("translation_complete", result)
         return result
 
+    def translate_batch(self, process_ids, segment_ids, offsets):
+        """Translates many addresses at once without per-address results or signals.
+
+        Takes three equal-length sequences and returns (physical_addresses,
+        status_codes): physical addresses are -1 for faults, and status codes
+        are TRANSLATION_SUCCESS, OFFSET_OUT_OF_BOUNDS or SEGMENT_NOT_FOUND.
+        With NumPy the bounds check and base addition are vectorized over a
+        flattened base/limit table and NumPy arrays are returned; otherwise
+        the result is a pair of array.array columns.
+        """
+        if np is None:
+            physical_addresses, status_codes = self._translate_batch_loop(process_ids, segment_ids, offsets)
+            successes = status_codes.count(TRANSLATION_SUCCESS)
+        else:
+            physical_addresses, status_codes = self._translate_batch_numpy(process_ids, segment_ids, offsets)
+            successes = int(np.count_nonzero(status_codes == TRANSLATION_SUCCESS))
+
+        self.translation_results["success"] += successes
+        self.translation_results["fault"] += len(status_codes) - successes
+        return physical_addresses, status_codes
+
+    def _translate_batch_loop(self, process_ids, segment_ids, offsets):
+        physical_addresses = array("q")
+        status_codes = array("b")
+        for process_id, segment_id, offset in zip(process_ids, segment_ids, offsets):
+            segments = self.segment_table.get(process_id)
+            segment = segments.get(segment_id) if segments else None
+            if segment is None:
+                physical_addresses.append(-1)
+                status_codes.append(SEGMENT_NOT_FOUND)
+            elif 0 <= offset < segment.limit:
+                physical_addresses.append(segment.base + offset)
+                status_codes.append(TRANSLATION_SUCCESS)
+            else:
+                physical_addresses.append(-1)
+                status_codes.append(OFFSET_OUT_OF_BOUNDS)
+        return physical_addresses, status_codes
+
+    def _get_flat_table(self):
+        """Flattens the segment tables into row-indexed base/limit arrays, cached until the next allocation."""
+        if self._flat_table is None:
+            keys = [(process_id, segment_id)
+                    for process_id, segments in self.segment_table.items()
+                    for segment_id in segments]
+            segments = [self.segment_table[process_id][segment_id] for process_id, segment_id in keys]
+            table = {
+                "row_of": {key: row for row, key in enumerate(keys)},
+                "bases": np.fromiter((seg.base for seg in segments), dtype=np.int64, count=len(segments)),
+                "limits": np.fromiter((seg.limit for seg in segments), dtype=np.int64, count=len(segments)),
+                "encoded": None,
+            }
+            # Small non-negative integer IDs pack into one int64 key, so rows can be found with searchsorted
+            if all(isinstance(p, int) and isinstance(s, int) and 0 <= p < 2 ** 31 and 0 <= s < 2 ** 31
+                   for p, s in keys):
+                encoded = np.fromiter(((p << 32) | s for p, s in keys), dtype=np.int64, count=len(keys))
+                order = np.argsort(encoded)
+                table["encoded"] = (encoded[order], order)
+            self._flat_table = table
+        return self._flat_table
+
+    def _lookup_rows(self, table, process_ids, segment_ids):
+        """Returns the flat-table row of every (process_id, segment_id), or -1 if it does not exist."""
+        if table["encoded"] is not None:
+            pids = np.asarray(process_ids)
+            sids = np.asarray(segment_ids)
+            if (pids.dtype.kind in "iu" and sids.dtype.kind in "iu" and pids.size
+                    and pids.min() >= 0 and sids.min() >= 0 and pids.max() < 2 ** 31 and sids.max() < 2 ** 31):
+                sorted_keys, order = table["encoded"]
+                wanted = (pids.astype(np.int64) << 32) | sids.astype(np.int64)
+                positions = np.minimum(np.searchsorted(sorted_keys, wanted), len(sorted_keys) - 1)
+                return np.where(sorted_keys[positions] == wanted, order[positions], -1)
+        row_of = table["row_of"]
+        return np.fromiter((row_of.get(key, -1) for key in zip(process_ids, segment_ids)),
+                           dtype=np.int64, count=len(process_ids))
+
+    def _translate_batch_numpy(self, process_ids, segment_ids, offsets):
+        offsets = np.asarray(offsets, dtype=np.int64)
+        table = self._get_flat_table()
+        if not len(table["bases"]):
+            return np.full(offsets.shape, -1, dtype=np.int64), np.full(offsets.shape, SEGMENT_NOT_FOUND, dtype=np.int8)
+
+        rows = self._lookup_rows(table, process_ids, segment_ids)
+        found = rows >= 0
+        rows = np.where(found, rows, 0)
+        bases = table["bases"][rows]
+        in_bounds = found & (offsets >= 0) & (offsets < table["limits"][rows])
+
+        physical_addresses = np.where(in_bounds, bases + offsets, -1)
+        status_codes = np.where(in_bounds, TRANSLATION_SUCCESS,
+                                np.where(found, OFFSET_OUT_OF_BOUNDS, SEGMENT_NOT_FOUND)).astype(np.int8)
+        return physical_addresses, status_codes
+
     def bulk_allocate(self, segment_data):
-        """Handles bulk allocation for multiple processes."""
+        """Handles bulk allocation for multiple processes.
+
+        Returns every overlap as a ((process_id, segment_id), (process_id, segment_id))
+        pair, found with one interval-index query per new segment.
+        """
+        overlaps = []
         for seg in segment_data:
             process_id, segment_id, base, limit = seg
             self.allocate_segment(process_id, segment_id, base, limit)
+            key = (process_id, segment_id)
+            overlaps.extend((other, key) for other in self.physical_index.overlapping(base, base + limit)
+                            if other != key)
+        return overlaps
+
+    def owners_of(self, physical_address):
+        """Returns the (process_id, segment_id) of every segment containing a physical address."""
+        return self.physical_index.containing(physical_address)
+
+    def owners_in_range(self, start, end):
+        """Returns the (process_id, segment_id) of every segment intersecting [start, end)."""
+        return self.physical_index.overlapping(start, end)
+
+    def find_overlaps(self):
+        """Returns every pair of segments whose physical ranges overlap."""
+        orders = self.physical_index.orders
+        overlaps = []
+        for process_id, segments in self.segment_table.items():
+            for segment_id, segment in segments.items():
+                key = (process_id, segment_id)
+                # Report each pair once, from the segment that sorts first by base
+                overlaps.extend((key, other)
+                                for other in self.physical_index.overlapping(segment.base, segment.base + segment.limit)
+                                if orders[other] > orders[key])
+        return overlaps
+
+    def explain_fault(self, process_id, segment_id, offset):
+        """Describes what an out-of-bounds access would have touched in physical memory."""
+        segments = self.segment_table.get(process_id)
+        segment = segments.get(segment_id) if segments else None
+        if segment is None:
+            return {"reason": "segment not found", "physical_address": None, "owners": []}
+        physical_address = segment.base + offset
+        if 0 <= offset < segment.limit:
+            reason = "within bounds"
+        else:
+            reason = f"offset {offset} outside limit {segment.limit}"
+        return {"reason": reason, "physical_address": physical_address, "owners": self.owners_of(physical_address)}
 
     def bulk_translate(self, translation_data):
         """Handles bulk translation for multiple processes."""
         results = []
-        for trans in translation_data:
+        before = dict(self.translation_results)
+        progress = self.track_progress(translation_data, "translation", lambda: {
+            outcome: count - before[outcome] for outcome, count in self.translation_results.items()})
+        for trans in progress:
             process_id, segment_id, offset = trans
             results.append(self.translate_address(process_id, segment_id, offset))
         return results
 
-    def create_visualization(self):
-        """Generates and directly displays visualization."""
-        fig, axs = plt.subplots(1, 2, figsize=(12, 6))
+    def create_visualization(self, output_path=None, max_segments=DEFAULT_MAX_SEGMENTS,
+                             max_labels=DEFAULT_MAX_LABELS, bins=512):
+        """Builds the memory layout and translation outcome charts.
+
+        Up to `max_segments` segments are drawn one row each as a single
+        PolyCollection, labelled while there are at most `max_labels`; past
+        that the layout is aggregated into an occupancy profile over `bins`
+        address bins. Returns the figure, or the path it was written to
+        off-screen when `output_path` (.png/.svg/.pdf) is given.
+        """
+        from matplotlib.collections import PolyCollection  # Loaded on first use so the core stays headless
+        from charts.figures import interval_coverage, new_figure, save_figure
+
+        fig, axs = new_figure(2)
+        segments = [(process_id, segment) for process_id, table in self.segment_table.items()
+                    for segment in table.values()]
 
         # Memory Allocation Visualization
-        y = 0
-        for process_id, segments in self.segment_table.items():
-            for segment in segments:
-                axs[0].barh(y, segment.limit, left=segment.base, color='blue', edgecolor='black')
-                axs[0].text(segment.base + segment.limit / 2, y, 
-                           f'P{process_id}-S{segment.segment_id}', 
-                           ha='center', va='center', color='white', fontsize=10)
-                y += 1
+        if len(segments) <= max_segments:
+            boxes = [[(segment.base, y - 0.4), (segment.base + segment.limit, y - 0.4),
+                      (segment.base + segment.limit, y + 0.4), (segment.base, y + 0.4)]
+                     for y, (_, segment) in enumerate(segments)]
+            # Outlines merge into a smear once rows get thin, so only small layouts get them
+            edges = 'black' if len(segments) <= max_labels else 'face'
+            axs[0].add_collection(PolyCollection(boxes, facecolors='blue', edgecolors=edges))
+            axs[0].autoscale_view()
+            if len(segments) <= max_labels:
+                for y, (process_id, segment) in enumerate(segments):
+                    axs[0].text(segment.base + segment.limit / 2, y,
+                                f'P{process_id}-S{segment.segment_id}',
+                                ha='center', va='center', color='white', fontsize=10)
+            axs[0].set_ylabel("Segments")
+        else:
+            edges, depths = interval_coverage(
+                [(segment.base, segment.base + segment.limit) for _, segment in segments], bins)
+            axs[0].stairs(depths, edges, fill=True, color='blue')
+            axs[0].set_ylabel(f"Segments per Address ({len(segments)} segments)")
         axs[0].set_xlabel("Memory Address")
-        axs[0].set_ylabel("Segments")
         axs[0].set_title("Memory Allocation (Segmentation)")
 
         # Translation Results Visualization
@@ -113,15 +387,18 @@ class SegmentationSystem(QObject):
         axs[1].set_ylabel("Count")
         axs[1].set_title("Address Translation Results")
 
-        plt.tight_layout()
-        plt.show()  # Directly display graph instead of saving
+        if output_path is not None:
+            return save_figure(fig, output_path)
+        return fig
 
     def get_segment_table(self):
-        """Returns segment table data for GUI display."""
-        return {
-            process_id: [
-                {"id": seg.segment_id, "base": seg.base, "limit": seg.limit}
-                for seg in segments
-            ]
-            for process_id, segments in self.segment_table.items()
-        }
+        """Returns segment table data for GUI display, rebuilt only after the table changes."""
+        if self._table_view is None:
+            self._table_view = {
+                process_id: [
+                    {"id": seg.segment_id, "base": seg.base, "limit": seg.limit}
+                    for seg in segments.values()
+                ]
+                for process_id, segments in self.segment_table.items()
+            }
+        return self._table_view
@@ -1,14 +1,23 @@
 import sys
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit
+from functools import partial
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit, QProgressBar
 from PyQt6.QtGui import QFont
 
+from charts.figures import update_bars
+from events.qt_bridge import QtEventBridge, start_worker
 from .segmentation import SegmentationSystem
 
 class SegmentationGUI(QWidget):
     def __init__(self):
         super().__init__()
         self.system = SegmentationSystem()
+        self.canvas = None
+        self.worker = None
+        self.translation_base = dict(self.system.translation_results)
         self.init_ui()
+        self.events = QtEventBridge(self.system, self, events=("progress",))
+        self.events.subscribe("progress", self.update_progress)
 
     def init_ui(self):
         self.setWindowTitle("Segmentation System")
@@ -66,14 +75,21 @@ class SegmentationGUI(QWidget):
         self.translate_btn = QPushButton("Translate Address", self)
         self.translate_btn.setStyleSheet(btn_style)
         self.translate_btn.clicked.connect(self.translate_address)
+        self.cancel_btn = QPushButton("Cancel Translation", self)
+        self.cancel_btn.setStyleSheet(btn_style)
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_translation)
+        self.progress_bar = QProgressBar(self)
 
         layout.addWidget(self.create_label("Translation - Process ID:"))
         layout.addWidget(self.translation_process_id)
         layout.addWidget(self.create_label("Segment ID:"))
         layout.addWidget(self.translation_segment_id)
-        layout.addWidget(self.create_label("Offset:"))
+        layout.addWidget(self.create_label("Offset(s):"))
         layout.addWidget(self.offset_input)
         layout.addWidget(self.translate_btn)
+        layout.addWidget(self.cancel_btn)
+        layout.addWidget(self.progress_bar)
 
         # Output Display
         self.output = QTextEdit(self)
@@ -100,20 +116,89 @@ class SegmentationGUI(QWidget):
         base = int(self.base_input.text())
         limit = int(self.limit_input.text())
 
-        self.system.allocate_segment(process_id, segment_id, base, limit)
+        try:
+            self.system.allocate_segment(process_id, segment_id, base, limit)
+        except ValueError as error:
+            self.output.append(str(error))
+            return
         self.output.append(f"Allocated Segment {segment_id} to Process {process_id}")
 
     def translate_address(self):
         process_id = self.translation_process_id.text()
         segment_id = self.translation_segment_id.text()
-        offset = int(self.offset_input.text())
-
-        result = self.system.translate_address(process_id, segment_id, offset)
-        self.output.append(result["message"])
+        try:
+            offsets = [int(offset) for offset in self.offset_input.text().replace(",", " ").split()]
+        except ValueError:
+            self.output.append("Offsets must be integers")
+            return
+        if not offsets:
+            self.output.append("Enter at least one offset")
+            return
+
+        if len(offsets) == 1:
+            result = self.system.translate_address(process_id, segment_id, offsets[0])
+            self.output.append(result["message"])
+            return
+
+        # Several offsets: translate on a worker thread with live outcome counts
+        self.translation_base = dict(self.system.translation_results)
+        self.show_canvas(self.system.create_visualization())
+        self.progress_bar.setValue(0)
+        self.set_running(True)
+        translations = [(process_id, segment_id, offset) for offset in offsets]
+        self.worker = start_worker(self, self.system, partial(self.system.bulk_translate, translations),
+                                   finished=self.translation_finished, cancelled=self.translation_cancelled,
+                                   failed=self.translation_failed)
+        self.worker.done.connect(self.translation_done)
+
+    def set_running(self, running):
+        # The segment table must not change under a running translation
+        self.allocate_btn.setEnabled(not running)
+        self.translate_btn.setEnabled(not running)
+        self.visualize_btn.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+
+    def cancel_translation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def translation_finished(self, results):
+        self.progress_bar.setValue(100)
+        faults = sum(1 for result in results if result["status"] == "fault")
+        self.output.append(f"Translated {len(results)} addresses: {len(results) - faults} successful, {faults} faults")
+
+    def translation_cancelled(self):
+        self.output.append("Translation cancelled")
+
+    def translation_failed(self, message):
+        self.output.append(f"Translation failed: {message}")
+
+    def translation_done(self):
+        self.worker = None
+        self.set_running(False)
+
+    def update_progress(self, progress):
+        """Advances the progress bar and the live translation outcome bars."""
+        if progress["total"]:
+            self.progress_bar.setValue(100 * progress["done"] // progress["total"])
+        if self.canvas is not None:
+            update_bars(self.canvas.figure.axes[1], [self.translation_base["success"] + progress["success"],
+                                                     self.translation_base["fault"] + progress["fault"]])
+            self.canvas.draw_idle()
 
     def generate_visualization(self):
-        image_path = self.system.create_visualization()
-        self.output.append(f"Visualization saved as {image_path}")
+        self.show_canvas(self.system.create_visualization())
+        self.output.append("Visualization updated")
+
+    def show_canvas(self, fig):
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas  # Loaded with the first chart
+
+        if self.canvas is not None:
+            self.layout().removeWidget(self.canvas)
+            self.canvas.deleteLater()
+        self.canvas = FigureCanvas(fig)
+        self.layout().addWidget(self.canvas)
+        self.canvas.draw()
 
 # Running the App
 if __name__ == "__main__":
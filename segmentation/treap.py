@@ -0,0 +1,80 @@
+class Node:
+    """Treap node ordered by `order`, with random heap `priority`.
+
+    `max_value` is the largest `value` in the node's subtree, which lets
+    searches skip whole subtrees: the free-hole index keys holes by start
+    with their size as value, the interval index keys intervals by start
+    with their end as value.
+    """
+
+    __slots__ = ("order", "value", "priority", "left", "right", "max_value")
+
+    def __init__(self, order, value, priority):
+        self.order = order
+        self.value = value
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_value = value
+
+
+def update(node):
+    node.max_value = node.value
+    if node.left is not None and node.left.max_value > node.max_value:
+        node.max_value = node.left.max_value
+    if node.right is not None and node.right.max_value > node.max_value:
+        node.max_value = node.right.max_value
+
+
+def split(node, order):
+    """Splits a treap into the nodes ordered before `order` and the rest."""
+    if node is None:
+        return None, None
+    if node.order < order:
+        node.right, right = split(node.right, order)
+        update(node)
+        return node, right
+    left, node.left = split(node.left, order)
+    update(node)
+    return left, node
+
+
+def merge(left, right):
+    """Joins two treaps whose nodes in `left` are all ordered before those in `right`."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = merge(left.right, right)
+        update(left)
+        return left
+    right.left = merge(left, right.left)
+    update(right)
+    return right
+
+
+def insert(root, node):
+    """Returns the treap with `node` added."""
+    left, right = split(root, node.order)
+    return merge(merge(left, node), right)
+
+
+def remove(root, order):
+    """Returns the treap without the node ordered at `order`, which must be present."""
+    if root.order == order:
+        return merge(root.left, root.right)
+    if order < root.order:
+        root.left = remove(root.left, order)
+    else:
+        root.right = remove(root.right, order)
+    update(root)
+    return root
+
+
+def in_order(node):
+    """Yields the nodes in order."""
+    while node is not None:
+        yield from in_order(node.left)
+        yield node
+        node = node.right
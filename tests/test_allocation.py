@@ -0,0 +1,28 @@
+import random
+import unittest
+
+from paging.allocation import simulate_allocation
+
+
+class WorkingSetTest(unittest.TestCase):
+    def test_never_beats_belady_with_the_same_frames(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            num_frames = rng.randrange(1, 10)
+            requests = [(rng.randrange(3), rng.randrange(8)) for _ in range(300)]
+            working_set = simulate_allocation(requests, num_frames, mode="local", allocator="working_set",
+                                              window=rng.randrange(1, 30))
+            optimal = simulate_allocation(requests, num_frames, "Optimal")
+            self.assertGreaterEqual(working_set["page_faults"], optimal["page_faults"])
+
+    def test_deactivated_process_faults_its_pages_back(self):
+        # Two processes of three pages each cannot share four frames
+        requests = [(0, 1), (0, 2), (0, 3), (1, 1), (1, 2), (1, 3), (0, 1), (0, 2), (0, 3)]
+        result = simulate_allocation(requests, 4, mode="local", allocator="working_set", window=10)
+        self.assertEqual(result["processes"][0]["faults"], 6)
+        self.assertEqual(result["processes"][1]["faults"], 3)
+        self.assertGreater(result["overcommitted_accesses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+from segmentation.allocator import STRATEGIES, MemoryAllocator
+
+MEMORY_SIZE = 300
+
+
+class ReferenceAllocator:
+    """Byte map of the memory, searched linearly."""
+
+    def __init__(self, memory_size, strategy):
+        self.owners = [None] * memory_size
+        self.strategy = strategy
+        self.next_start = 0
+
+    def holes(self):
+        holes, start = [], None
+        for address, owner in enumerate(self.owners + [0]):
+            if owner is None and start is None:
+                start = address
+            elif owner is not None and start is not None:
+                holes.append((start, address - start))
+                start = None
+        return holes
+
+    def allocate(self, size, owner):
+        fits = [hole for hole in self.holes() if hole[1] >= size]
+        if not fits:
+            return None
+        if self.strategy == "first_fit":
+            start = fits[0][0]
+        elif self.strategy == "next_fit":
+            start = next((hole for hole in fits if hole[0] >= self.next_start), fits[0])[0]
+        elif self.strategy == "best_fit":
+            start = min(fits, key=lambda hole: (hole[1], hole[0]))[0]
+        else:
+            start = max(fits, key=lambda hole: (hole[1], hole[0]))[0]
+        self.owners[start:start + size] = [owner] * size
+        self.next_start = start + size
+        return start
+
+    def free(self, base, size):
+        self.owners[base:base + size] = [None] * size
+
+
+class AllocatorTest(unittest.TestCase):
+    def test_matches_byte_map(self):
+        for strategy in STRATEGIES:
+            rng = random.Random(0)
+            allocator = MemoryAllocator(MEMORY_SIZE, strategy)
+            reference = ReferenceAllocator(MEMORY_SIZE, strategy)
+            live = {}
+            for step in range(2000):
+                if live and rng.random() < 0.45:
+                    base = rng.choice(sorted(live))
+                    allocator.free(base)
+                    reference.free(base, live.pop(base))
+                else:
+                    size = rng.randrange(1, 40)
+                    base = allocator.allocate(size, step)
+                    self.assertEqual(base, reference.allocate(size, step), (strategy, step))
+                    if base is not None:
+                        live[base] = size
+                holes = reference.holes()
+                self.assertEqual(allocator.holes(), holes, (strategy, step))
+                stats = allocator.stats()
+                self.assertEqual(stats["allocated"], sum(live.values()))
+                self.assertEqual(stats["hole_count"], len(holes))
+                self.assertEqual(stats["largest_hole"], max((size for _, size in holes), default=0))
+
+    def test_reserve_and_compact(self):
+        allocator = MemoryAllocator(MEMORY_SIZE)
+        self.assertEqual(allocator.reserve(100, 50, "a"), 100)
+        self.assertEqual(allocator.reserve(20, 10, "b"), 20)
+        self.assertEqual(allocator.holes(), [(0, 20), (30, 70), (150, 150)])
+        for base, size in ((90, 20), (140, 20), (295, 10)):
+            with self.assertRaises(ValueError):
+                allocator.reserve(base, size)
+
+        self.assertEqual(allocator.compact(), ([("b", 20, 0), ("a", 100, 10)], 60))
+        self.assertEqual(allocator.holes(), [(60, 240)])
+        self.assertEqual(allocator.blocks, {0: (10, "b"), 10: (50, "a")})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import unittest
+
+from segmentation.interval_index import IntervalIndex
+
+
+class IntervalIndexTest(unittest.TestCase):
+    def test_matches_linear_scan(self):
+        rng = random.Random(0)
+        index = IntervalIndex()
+        intervals = {}  # key -> (start, insertion step, end)
+        for step in range(3000):
+            key = rng.randrange(100)
+            if key in intervals and rng.random() < 0.3:
+                index.remove(key)
+                del intervals[key]
+            else:
+                start = rng.randrange(1000)
+                end = start + rng.randrange(1, 60)
+                index.add(key, start, end)
+                intervals[key] = (start, step, end)
+            self.assertEqual(len(index), len(intervals))
+
+            start = rng.randrange(-10, 1010)
+            end = start + rng.randrange(1, 40)
+            expected = [key for key, (first, _, last) in sorted(intervals.items(), key=lambda item: item[1][:2])
+                        if first < end and last > start]
+            self.assertEqual(index.overlapping(start, end), expected)
+            self.assertEqual(sorted(index.containing(start)),
+                             sorted(key for key, (first, _, last) in intervals.items() if first <= start < last))
+
+    def test_readding_a_key_replaces_its_interval(self):
+        index = IntervalIndex()
+        index.add("a", 0, 10)
+        index.add("a", 20, 30)
+        self.assertEqual(index.containing(5), [])
+        self.assertEqual(index.containing(25), ["a"])
+        self.assertIn("a", index)
+        index.remove("a")
+        self.assertNotIn("a", index)
+        self.assertEqual(index.overlapping(0, 100), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import random
+import unittest
+
+from paging.paging import PagingSystem
+from paging.policies import available_policies
+
+PAGE_SIZE = 64
+
+
+def fifo_faults(requests, frames):
+    memory, faults = [], 0
+    for key in requests:
+        if key not in memory:
+            faults += 1
+            if len(memory) == frames:
+                memory.pop(0)
+            memory.append(key)
+    return faults
+
+
+def lru_faults(requests, frames):
+    memory, faults = [], 0
+    for key in requests:
+        if key in memory:
+            memory.remove(key)
+        else:
+            faults += 1
+            if len(memory) == frames:
+                memory.pop(0)
+        memory.append(key)
+    return faults
+
+
+def optimal_faults(requests, frames):
+    memory, faults = [], 0
+    for i, key in enumerate(requests):
+        if key in memory:
+            continue
+        faults += 1
+        if len(memory) == frames:
+            future = requests[i + 1:]
+            memory.remove(max(memory, key=lambda page: future.index(page) if page in future else len(future)))
+        memory.append(key)
+    return faults
+
+
+def clock_faults(requests, frames):
+    pages, referenced, hand, faults = [], [], 0, 0
+    for key in requests:
+        if key in pages:
+            referenced[pages.index(key)] = True
+            continue
+        faults += 1
+        if len(pages) < frames:
+            pages.append(key)
+            referenced.append(True)
+            continue
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % frames
+        pages[hand] = key
+        referenced[hand] = True
+        hand = (hand + 1) % frames
+    return faults
+
+
+def lfu_faults(requests, frames):
+    count, last_use, faults = {}, {}, 0
+    for now, key in enumerate(requests):
+        if key in count:
+            count[key] += 1
+        else:
+            faults += 1
+            if len(count) == frames:
+                victim = min(count, key=lambda page: (count[page], last_use[page]))
+                del count[victim]
+            count[key] = 1
+        last_use[key] = now
+    return faults
+
+
+def two_queue_faults(requests, frames):
+    in_size, out_size = max(1, int(frames * 0.25)), max(1, int(frames * 0.5))
+    a1_in, a1_out, am, faults = [], [], [], 0
+    for key in requests:
+        if key in am:
+            am.remove(key)
+            am.append(key)
+            continue
+        if key in a1_in:
+            continue
+        faults += 1
+        if len(a1_in) + len(am) == frames:
+            if a1_in and (len(a1_in) > in_size or not am):
+                a1_out.append(a1_in.pop(0))
+            else:
+                am.pop(0)
+        if key in a1_out:
+            a1_out.remove(key)
+            am.append(key)
+        else:
+            a1_in.append(key)
+        del a1_out[:max(0, len(a1_out) - out_size)]
+    return faults
+
+
+def arc_faults(requests, c):
+    """Follows the pseudocode of Megiddo & Modha, "ARC: A Self-Tuning, Low Overhead Replacement Cache"."""
+    t1, t2, b1, b2 = [], [], [], []
+    p, faults = 0.0, 0
+
+    def replace(key):
+        if t1 and (len(t1) > p or (key in b2 and len(t1) == p) or not t2):
+            b1.append(t1.pop(0))
+        else:
+            b2.append(t2.pop(0))
+
+    for key in requests:
+        if key in t1 or key in t2:
+            (t1 if key in t1 else t2).remove(key)
+            t2.append(key)
+            continue
+        faults += 1
+        if key in b1:
+            p = min(c, p + max(len(b2) / len(b1), 1))
+            replace(key)
+            b1.remove(key)
+            t2.append(key)
+        elif key in b2:
+            p = max(0, p - max(len(b1) / len(b2), 1))
+            replace(key)
+            b2.remove(key)
+            t2.append(key)
+        else:
+            if len(t1) + len(b1) == c:
+                if len(t1) < c:
+                    b1.pop(0)
+                    replace(key)
+                else:
+                    t1.pop(0)
+            elif len(t1) + len(t2) + len(b1) + len(b2) >= c:
+                if len(t1) + len(t2) + len(b1) + len(b2) == 2 * c:
+                    b2.pop(0)
+                replace(key)
+            t1.append(key)
+    return faults
+
+
+REFERENCES = {
+    "FIFO": fifo_faults,
+    "LRU": lru_faults,
+    "Optimal": optimal_faults,
+    "CLOCK": clock_faults,
+    "LFU": lfu_faults,
+    "2Q": two_queue_faults,
+    "ARC": arc_faults,
+}
+
+
+def simulate(algorithm, requests, frames):
+    system = PagingSystem(frames * PAGE_SIZE, PAGE_SIZE, frames)
+    system.page_requests.extend(requests)
+    return system.simulate_algorithm(algorithm)[0]
+
+
+class PolicyRegistryTest(unittest.TestCase):
+    def test_every_policy_has_a_reference(self):
+        self.assertEqual(set(available_policies()), set(REFERENCES))
+
+    def test_faults_match_brute_force(self):
+        rng = random.Random(0)
+        for trial in range(150):
+            frames = rng.randrange(1, 9)
+            processes = rng.randrange(1, 3)
+            requests = [(rng.randrange(processes), rng.randrange(rng.randrange(2, 16)))
+                        for _ in range(rng.randrange(1, 200))]
+            for algorithm, reference in REFERENCES.items():
+                with self.subTest(algorithm=algorithm, trial=trial):
+                    self.assertEqual(simulate(algorithm, requests, frames), reference(requests, frames))
+
+    def test_optimal_is_a_lower_bound(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            frames = rng.randrange(1, 8)
+            requests = [(0, rng.randrange(12)) for _ in range(300)]
+            optimal = simulate("Optimal", requests, frames)
+            for algorithm in REFERENCES:
+                self.assertGreaterEqual(simulate(algorithm, requests, frames), optimal)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from paging.paging import PagingSystem
+from paging.stack_distance import fault_curve, lru_stack_distances
+
+PAGE_SIZE = 64
+
+
+def brute_force_lru_distances(requests):
+    distances = []
+    for i, key in enumerate(requests):
+        if key not in requests[:i]:
+            distances.append(None)
+            continue
+        previous = i - 1 - requests[i - 1::-1].index(key)
+        distances.append(len(set(requests[previous + 1:i])) + 1)
+    return distances
+
+
+def simulated_faults(algorithm, requests, frames):
+    if frames == 0:
+        return len(requests)
+    system = PagingSystem(frames * PAGE_SIZE, PAGE_SIZE, frames)
+    system.page_requests.extend(requests)
+    return system.simulate_algorithm(algorithm)[0]
+
+
+class StackDistanceTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.traces = [[(rng.randrange(2), rng.randrange(rng.randrange(1, 12))) for _ in range(rng.randrange(150))]
+                       for _ in range(60)]
+
+    def test_lru_distances_match_brute_force(self):
+        for requests in self.traces:
+            self.assertEqual(lru_stack_distances(requests), brute_force_lru_distances(requests))
+
+    def test_fault_curves_match_one_simulation_per_frame_count(self):
+        for algorithm in ("LRU", "Optimal"):
+            for requests in self.traces:
+                curve = fault_curve(requests, algorithm)
+                expected = [simulated_faults(algorithm, requests, frames) for frames in range(len(curve))]
+                self.assertEqual(curve, expected, algorithm)
+
+    def test_curve_past_the_distinct_pages_is_flat(self):
+        requests = [(0, page) for page in (1, 2, 3, 1, 2, 4, 1)]
+        self.assertEqual(fault_curve(requests, "LRU", 6), [7, 7, 7, 4, 4, 4, 4])
+
+    def test_rejects_non_stack_algorithms(self):
+        with self.assertRaises(ValueError):
+            fault_curve([(0, 1)], "FIFO")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import random
+import unittest
+
+from virtual_memory.sweep import run_sweep
+from virtual_memory.virtual_memory import VirtualMemorySystem
+
+PAGE_SIZE = 256
+
+
+class VirtualMemorySweepTest(unittest.TestCase):
+    def test_matches_sequential_runs(self):
+        rng = random.Random(0)
+        pages = [(rng.randrange(2), rng.randrange(12), "data", rng.choice("RW")) for _ in range(500)]
+        rows = run_sweep(pages, ["FIFO", "LRU", "Optimal"], [PAGE_SIZE, 4 * PAGE_SIZE], 32 * PAGE_SIZE, PAGE_SIZE,
+                         max_workers=2)
+        self.assertEqual([(row["algorithm"], row["frames"]) for row in rows],
+                         [(algorithm, frames) for algorithm in ("FIFO", "LRU", "Optimal") for frames in (1, 4)])
+        for row in rows:
+            system = VirtualMemorySystem("counters")
+            system.configure(row["ram_size"], 32 * PAGE_SIZE, PAGE_SIZE)
+            expected = system.run_simulation(pages, [row["algorithm"]])[row["algorithm"]]
+            self.assertEqual((row["hits"], row["faults"], row["writeback"]),
+                             (expected["hits"], expected["faults"], expected["writeback"]))
+            self.assertEqual(row["access_history"], expected["access_history"].counters())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import random
+import tempfile
+import unittest
+
+from paging import trace
+from paging.trace import TRACE_HEADER, PageTrace, TraceFile, next_use_index, write_trace_file
+
+PAGE_SIZE = 256
+
+
+class TraceFileTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "trace.bin")
+        rng = random.Random(0)
+        self.records = [(rng.randrange(-3, 5), rng.randrange(2 ** 40)) for _ in range(1000)]
+        self.pages = [(process_id, address // PAGE_SIZE) for process_id, address in self.records]
+
+    def test_round_trip(self):
+        self.assertEqual(write_trace_file(self.path, iter(self.records), PAGE_SIZE, chunk_records=7), 1000)
+        with TraceFile(self.path, chunk_records=64) as trace_file:
+            self.assertEqual(trace_file.page_size, PAGE_SIZE)
+            self.assertEqual(trace_file.process_count, len({process_id for process_id, _ in self.records}))
+            self.assertEqual(len(trace_file), len(self.pages))
+            self.assertEqual(list(trace_file), self.pages)
+            self.assertEqual([trace_file[i] for i in range(-len(self.pages), len(self.pages))], self.pages * 2)
+            with self.assertRaises(IndexError):
+                trace_file[len(self.pages)]
+            self.assertEqual(list(trace_file.with_data("x")), [(*page, "x") for page in self.pages])
+
+    def test_empty_trace(self):
+        write_trace_file(self.path, [], PAGE_SIZE)
+        with TraceFile(self.path) as trace_file:
+            self.assertEqual(list(trace_file), [])
+
+    def test_rejects_truncated_and_foreign_files(self):
+        write_trace_file(self.path, self.records, PAGE_SIZE)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError):
+            TraceFile(self.path)
+        for contents in (b"", b"0 100\n" * 20, bytes(TRACE_HEADER.size)):
+            with open(self.path, "wb") as f:
+                f.write(contents)
+            with self.assertRaises(ValueError):
+                TraceFile(self.path)
+
+
+class PageTraceTest(unittest.TestCase):
+    def test_add_addresses_matches_floor_division(self):
+        rng = random.Random(0)
+        addresses = [rng.randrange(2 ** 31 - 1) for _ in range(500)]
+        process_ids = [rng.randrange(4) for _ in addresses]
+        for numpy in (trace.np, None):
+            with self.subTest(numpy=numpy is not None):
+                self.patch_numpy(numpy)
+                page_trace = PageTrace(PAGE_SIZE, [(9, 9)])
+                page_trace.add_addresses(process_ids, addresses)
+                page_trace.add_addresses(7, iter(addresses))
+                expected = [(9, 9)] + [(process_id, address // PAGE_SIZE)
+                                       for process_id, address in zip(process_ids + [7] * 500, addresses * 2)]
+                self.assertEqual(list(page_trace), expected)
+
+    def test_failed_add_leaves_the_trace_unchanged(self):
+        bad_batches = (([10, 20], [1, 2 ** 40]), ([10, 20], [1.5, 2.5]), ([10, 20, 30], [1, 2]),
+                       ([10, 2 ** 40], [1, 2]))
+        for numpy in (trace.np, None):
+            self.patch_numpy(numpy)
+            page_trace = PageTrace(PAGE_SIZE, [(1, 1)])
+            for process_ids, addresses in bad_batches:
+                with self.subTest(numpy=numpy is not None, process_ids=process_ids, addresses=addresses):
+                    with self.assertRaises((ValueError, TypeError, OverflowError)):
+                        page_trace.add_addresses(process_ids, addresses)
+                    self.assertEqual(len(page_trace.process_ids), 1)
+                    self.assertEqual(list(page_trace), [(1, 1)])
+
+    def test_rejects_non_positive_page_size(self):
+        for page_size in (0, -PAGE_SIZE):
+            with self.assertRaises(ValueError):
+                PageTrace(page_size)
+
+    def test_next_use_index_matches_brute_force(self):
+        rng = random.Random(0)
+        requests = [(0, rng.randrange(10)) for _ in range(300)]
+        expected = [requests.index(key, i + 1) if key in requests[i + 1:] else len(requests)
+                    for i, key in enumerate(requests)]
+        self.assertEqual(list(next_use_index(requests)), expected)
+
+    def patch_numpy(self, numpy):
+        original = trace.np
+        trace.np = numpy
+        self.addCleanup(setattr, trace, "np", original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import copy
+import os
+import tempfile
+import unittest
+
+from virtual_memory.swap import DiskFullError
+from virtual_memory.virtual_memory import VirtualMemorySystem
+
+PAGE_SIZE = 256
+SMALL = b"a" * 200  # Compresses to 12 bytes with zlib level 1
+BIG = bytes(range(20)) * 10  # Compresses to 31 bytes
+
+
+class VirtualMemoryTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.swap_path = os.path.join(directory.name, "swap")
+        self.system = VirtualMemorySystem()
+        self.addCleanup(self.system.close)
+
+    def snapshot(self):
+        system = self.system
+        return (dict(system.ram), list(system.dirty), dict(system.swap.slots), system.swap.stats(),
+                dict(system.compressed.entries) if system.compressed is not None else None,
+                system.page_hits, system.page_faults, system.dirty_writebacks)
+
+
+class SwapFileTest(VirtualMemoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.system.configure(2 * PAGE_SIZE, PAGE_SIZE, PAGE_SIZE, self.swap_path)
+
+    def test_disk_full_changes_nothing(self):
+        self.system.load_page(0, 1, SMALL, "FIFO", "W")
+        self.system.load_page(0, 2, SMALL, "FIFO", "W")
+        self.system.load_page(0, 3, SMALL, "FIFO")  # Writes (0, 1) back into the only slot
+        before = self.snapshot()
+
+        # The next victim, (0, 2), is dirty too
+        with self.assertRaises(DiskFullError):
+            self.system.load_page(0, 4, SMALL, "FIFO")
+        self.assertEqual(self.snapshot(), before)
+
+    def test_disk_full_restores_the_policy(self):
+        for algorithm in ("FIFO", "LRU", "CLOCK", "LFU", "2Q", "ARC"):
+            with self.subTest(algorithm=algorithm):
+                self.system.reset_state()
+                for page in (1, 2, 3, 1):
+                    try:
+                        self.system.load_page(0, page, SMALL, algorithm, "W")
+                    except DiskFullError:
+                        pass
+                policy = self.system.policy
+                before = {name: copy.deepcopy(value) for name, value in vars(policy).items()
+                          if not name.startswith("_")}
+
+                # Every resident page is dirty and the only slot is taken, so any fault fails
+                for page in (1, 2, 3, 4, 5):
+                    if (0, page) not in self.system.ram:
+                        with self.assertRaises(DiskFullError):
+                            self.system.load_page(0, page, SMALL, algorithm)
+                self.assertEqual({name: value for name, value in vars(policy).items() if not name.startswith("_")},
+                                 before)
+
+    def test_clean_victim_needs_no_slot(self):
+        for page, access in ((1, "W"), (2, "R"), (3, "W"), (4, "R")):
+            self.system.load_page(0, page, SMALL, "FIFO", access)
+        self.assertEqual(set(self.system.ram), {(0, 3), (0, 4)})
+        self.assertEqual(self.system.swap.page_in((0, 1)), SMALL)
+        self.assertNotIn((0, 2), self.system.swap)
+
+        # The clean page was dropped, but refaulting it still reads its backing copy
+        self.system.load_page(0, 2, BIG, "FIFO")
+        self.assertEqual(self.system.ram[0, 2], SMALL)
+        self.assertEqual(self.system.disk_reads, 1)
+
+    def test_oversized_write_changes_nothing(self):
+        self.system.load_page(0, 1, SMALL, "FIFO", "W")
+        before = self.snapshot()
+        with self.assertRaises(ValueError):
+            self.system.load_page(0, 1, bytes(PAGE_SIZE + 1), "FIFO", "W")
+        self.assertEqual(self.snapshot(), before)
+
+
+class DiskDictTest(VirtualMemoryTestCase):
+    def test_rejects_geometry_without_a_frame(self):
+        for ram_size, page_size in ((0, PAGE_SIZE), (PAGE_SIZE - 1, PAGE_SIZE), (PAGE_SIZE, 0)):
+            with self.assertRaises(ValueError):
+                self.system.configure(ram_size, 4 * PAGE_SIZE, page_size)
+
+    def test_fault_reads_the_written_back_copy(self):
+        self.system.configure(PAGE_SIZE, 4 * PAGE_SIZE, PAGE_SIZE)
+        self.system.load_page(0, 1, BIG, "FIFO", "W")
+        self.system.load_page(0, 2, SMALL, "FIFO")
+        self.system.load_page(0, 1, SMALL, "FIFO")
+        self.assertEqual(self.system.ram, {(0, 1): BIG})
+        self.assertEqual(self.system.disk_reads, 1)
+
+
+    def test_dropped_clean_page_refaults_from_disk(self):
+        self.system.configure(PAGE_SIZE, 4 * PAGE_SIZE, PAGE_SIZE)
+        for page in (1, 2, 1):
+            self.system.load_page(0, page, SMALL, "FIFO")
+        self.assertEqual(self.system.disk_reads, 1)
+        self.assertEqual(self.system.dirty_writebacks, 0)
+        self.assertEqual(self.system.tier_stats()["cold_faults"], 2)
+
+
+class CompressedTierTest(VirtualMemoryTestCase):
+    def test_spill_needing_more_slots_than_free_changes_nothing(self):
+        self.system.configure(PAGE_SIZE, PAGE_SIZE, PAGE_SIZE, self.swap_path)
+        self.system.configure_compressed_tier(36)
+        self.system.load_page(0, 1, SMALL, "FIFO", "W")
+        self.system.load_page(0, 2, SMALL, "FIFO", "W")
+        self.system.load_page(0, 3, BIG, "FIFO", "W")
+        before = self.snapshot()
+
+        # Storing (0, 3) would spill the dirty pages (0, 1) and (0, 2), but the swap file has one slot
+        with self.assertRaises(DiskFullError):
+            self.system.load_page(0, 4, SMALL, "FIFO")
+
+        self.assertEqual(self.snapshot(), before)
+        self.assertEqual(self.system.ram, {(0, 3): BIG})
+        self.assertEqual(list(self.system.compressed.entries), [(0, 1), (0, 2)])
+
+    def test_spilled_pages_read_back_their_latest_payload(self):
+        self.system.configure(2 * PAGE_SIZE, 8 * PAGE_SIZE, PAGE_SIZE, self.swap_path)
+        self.system.configure_compressed_tier(40)
+        latest = {}
+        for step in range(60):
+            page = step * 7 % 5
+            if step % 3 == 0:
+                payload = bytes([step]) * 50 + BIG
+                latest[page] = payload
+                self.system.load_page(0, page, payload, "LRU", "W")
+            else:
+                self.system.load_page(0, page, latest.get(page, SMALL), "LRU")
+                self.assertEqual(self.system.ram[0, page], latest.get(page, SMALL))
+
+
+if __name__ == "__main__":
+    unittest.main()
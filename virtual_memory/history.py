@@ -0,0 +1,155 @@
+import struct
+import sys
+from array import array
+
+HISTORY_MODES = ("off", "counters", "sampled", "full")
+
+# Codes stored in the status and location columns; the names are what load_page reports
+STATUS_HIT = 0
+STATUS_FAULT = 1
+STATUS_NAMES = ("hit", "fault")
+
+LOCATION_RAM = 0
+LOCATION_REPLACED = 1  # Evicted a clean page
+LOCATION_REPLACED_DIRTY = 2  # Evicted a dirty page, which was written back
+LOCATION_NAMES = ("RAM", "RAM (replaced)", "RAM (replaced dirty)")
+
+# History file format: a fixed header followed by the columns back to back,
+# all little-endian. The positions column is only present for sampled histories.
+HISTORY_MAGIC = b"MMAH"
+HISTORY_VERSION = 1
+HISTORY_HEADER = struct.Struct("<4sHBBIQQQQQ")
+# magic, version, mode, reserved, sample_every, accesses, hits, faults, replacements, records
+_COLUMNS = (("positions", "q"), ("process_ids", "i"), ("page_numbers", "q"), ("statuses", "b"), ("locations", "b"))
+
+
+class AccessHistory:
+    """Per-access record of a virtual memory run, stored in typed columns.
+
+    `mode` selects how much is kept: "off" keeps nothing, "counters" only
+    the hit, fault and replacement totals, "sampled" the counters plus every
+    `sample_every`-th access (with its position), and "full" every access.
+    An access costs 14 bytes of array storage in full mode instead of a
+    dict. Indexing or iterating decodes records back into the dicts that
+    `load_page` returns.
+    """
+
+    __slots__ = ("mode", "sample_every", "algorithm", "accesses", "hits", "faults", "replacements",
+                 "positions", "process_ids", "page_numbers", "statuses", "locations", "record")
+
+    def __init__(self, mode="full", sample_every=1000, algorithm=None):
+        if mode not in HISTORY_MODES:
+            raise ValueError(f"Unknown history mode: {mode}")
+        if sample_every <= 0:
+            raise ValueError("sample_every must be positive")
+        self.mode = mode
+        self.sample_every = sample_every
+        self.algorithm = algorithm
+        self.accesses = 0
+        self.hits = 0
+        self.faults = 0
+        self.replacements = 0
+        for name, typecode in _COLUMNS:
+            setattr(self, name, array(typecode))
+        # Bind the recorder for the mode once instead of branching on every access
+        self.record = {
+            "off": self._record_nothing,
+            "counters": self._count,
+            "sampled": self._record_sample,
+            "full": self._record_all,
+        }[mode]
+
+    def _record_nothing(self, process_id, page_number, status, location):
+        pass
+
+    def _count(self, process_id, page_number, status, location):
+        self.accesses += 1
+        if status == STATUS_HIT:
+            self.hits += 1
+        else:
+            self.faults += 1
+            if location != LOCATION_RAM:
+                self.replacements += 1
+
+    def _record_sample(self, process_id, page_number, status, location):
+        if self.accesses % self.sample_every == 0:
+            self.positions.append(self.accesses)
+            self._append(process_id, page_number, status, location)
+        self._count(process_id, page_number, status, location)
+
+    def _record_all(self, process_id, page_number, status, location):
+        self._append(process_id, page_number, status, location)
+        self._count(process_id, page_number, status, location)
+
+    def _append(self, process_id, page_number, status, location):
+        self.process_ids.append(process_id)
+        self.page_numbers.append(page_number)
+        self.statuses.append(status)
+        self.locations.append(location)
+
+    def __len__(self):
+        return len(self.statuses)
+
+    def __getitem__(self, index):
+        return {
+            "process_id": self.process_ids[index],
+            "page_number": self.page_numbers[index],
+            "algorithm": self.algorithm,
+            "status": STATUS_NAMES[self.statuses[index]],
+            "location": LOCATION_NAMES[self.locations[index]],
+        }
+
+    def __iter__(self):
+        for index in range(len(self.statuses)):
+            yield self[index]
+
+    def nbytes(self):
+        """Returns the memory held by the record columns."""
+        return sum(len(column) * column.itemsize for column in self._columns())
+
+    def counters(self):
+        return {"accesses": self.accesses, "hits": self.hits, "faults": self.faults, "replacements": self.replacements}
+
+    def _columns(self):
+        columns = [getattr(self, name) for name, _ in _COLUMNS]
+        return columns if self.mode == "sampled" else columns[1:]
+
+    def export(self, path):
+        """Writes the counters and record columns to a compact binary file."""
+        with open(path, "wb") as f:
+            f.write(HISTORY_HEADER.pack(HISTORY_MAGIC, HISTORY_VERSION, HISTORY_MODES.index(self.mode), 0,
+                                        self.sample_every, self.accesses, self.hits, self.faults,
+                                        self.replacements, len(self)))
+            for column in self._columns():
+                if sys.byteorder == "big":
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                column.tofile(f)
+        return path
+
+
+def load_history(path):
+    """Reads a file written by AccessHistory.export back into an AccessHistory."""
+    with open(path, "rb") as f:
+        header = f.read(HISTORY_HEADER.size)
+        if len(header) < HISTORY_HEADER.size:
+            raise ValueError(f"{path} is not a history file")
+        magic, version, mode, _, sample_every, accesses, hits, faults, replacements, records = \
+            HISTORY_HEADER.unpack(header)
+        if magic != HISTORY_MAGIC or version != HISTORY_VERSION:
+            raise ValueError(f"{path} is not a version {HISTORY_VERSION} history file")
+
+        history = AccessHistory(HISTORY_MODES[mode], sample_every)
+        try:
+            for column in history._columns():
+                column.fromfile(f, records)
+                if sys.byteorder == "big":
+                    column.byteswap()
+        except EOFError:
+            raise ValueError(f"{path} is truncated")
+
+    history.accesses = accesses
+    history.hits = hits
+    history.faults = faults
+    history.replacements = replacements
+    return history
@@ -0,0 +1,215 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Maps prefetcher names to Prefetcher subclasses
+PREFETCHERS = {}
+
+
+def register_prefetcher(name):
+    """Class decorator that adds a prefetcher to the registry under `name`."""
+    def decorator(cls):
+        cls.name = name
+        PREFETCHERS[name] = cls
+        return cls
+    return decorator
+
+
+def create_prefetcher(name, **params):
+    """Returns a fresh instance of the registered prefetcher."""
+    if name not in PREFETCHERS:
+        raise ValueError(f"Unknown prefetcher: {name}")
+    return PREFETCHERS[name](**params)
+
+
+def available_prefetchers():
+    """Returns the names of all registered prefetchers."""
+    return list(PREFETCHERS)
+
+
+class Prefetcher:
+    """Decides which pages to read ahead of demand.
+
+    `on_access` sees every access and returns the page numbers of the same
+    process worth fetching. `on_useful` and `on_wasted` report what became of
+    each prefetch, so adaptive policies can tune themselves.
+    """
+
+    name = None
+
+    def on_access(self, process_id, page_number):
+        return ()
+
+    def on_useful(self, key):
+        """Called when a prefetched page is demanded before being dropped."""
+
+    def on_wasted(self, key):
+        """Called when a prefetched page is dropped without being used."""
+
+
+@register_prefetcher("sequential")
+class SequentialPrefetcher(Prefetcher):
+    """Readahead for sequential runs, with a window that adapts to how well it pays off.
+
+    Once a process touches page p + 1 right after page p, the pages up to
+    `window` ahead are fetched. The window doubles (up to `max_window`) each
+    time a readahead page gets used and halves each time one is wasted.
+    """
+
+    def __init__(self, window=4, max_window=64):
+        self.initial_window = window
+        self.max_window = max_window
+        self.streams = {}  # process_id -> [last page, window, furthest page issued]
+
+    def on_access(self, process_id, page_number):
+        stream = self.streams.get(process_id)
+        if stream is None or page_number != stream[0] + 1:
+            self.streams[process_id] = [page_number, self.initial_window, page_number]
+            return ()
+        stream[0] = page_number
+        first = max(stream[2], page_number) + 1
+        stream[2] = max(stream[2], page_number + stream[1])
+        return range(first, stream[2] + 1)
+
+    def on_useful(self, key):
+        stream = self.streams.get(key[0])
+        if stream is not None:
+            stream[1] = min(stream[1] * 2, self.max_window)
+
+    def on_wasted(self, key):
+        stream = self.streams.get(key[0])
+        if stream is not None:
+            stream[1] = max(stream[1] // 2, 1)
+
+
+@register_prefetcher("stride")
+class StridePrefetcher(Prefetcher):
+    """Per-process stride detection.
+
+    When the distance between consecutive pages of a process repeats
+    `confidence` times in a row, the next `degree` pages along that stride
+    are fetched.
+    """
+
+    def __init__(self, degree=4, confidence=2):
+        self.degree = degree
+        self.confidence = confidence
+        self.streams = {}  # process_id -> [last page, stride, times seen in a row]
+
+    def on_access(self, process_id, page_number):
+        stream = self.streams.get(process_id)
+        if stream is None:
+            self.streams[process_id] = [page_number, 0, 0]
+            return ()
+        stride = page_number - stream[0]
+        if stride == stream[1]:
+            stream[2] += 1
+        else:
+            stream[1], stream[2] = stride, 1
+        stream[0] = page_number
+        if not stride or stream[2] < self.confidence:
+            return ()
+        pages = (page_number + stride * step for step in range(1, self.degree + 1))
+        return [page for page in pages if page >= 0]
+
+
+class PrefetchEngine:
+    """Runs prefetches on an I/O thread pool and keeps their results in a staging buffer.
+
+    Prefetched pages wait in a buffer of `buffer_pages` entries, outside the
+    frames managed by the replacement policy, much like the swap cache. A
+    fault on a buffered page takes it from there, waiting only for whatever
+    is left of its read; the oldest entries are dropped (and count as
+    wasted) when the buffer is full. Each read, demand or prefetch, pays
+    `io_latency` seconds of simulated device time, which the pool overlaps
+    with the demand accesses. The pool is started on the first prefetch
+    and stopped by `close`; prefetching after that starts a new one.
+    """
+
+    def __init__(self, prefetcher, buffer_pages=32, workers=2, io_latency=0.0):
+        self.prefetcher = prefetcher
+        self.buffer_pages = buffer_pages
+        self.io_latency = io_latency
+        self.workers = workers
+        self.executor = None
+        self.buffer = OrderedDict()  # key -> future of (data, read seconds)
+        self.issued = 0
+        self.useful = 0
+        self.wasted = 0
+        self.major_faults = 0  # Faults that had to wait for a full demand read
+        self.demand_read_time = 0.0
+        self.stall_time = 0.0  # Time faults spent waiting for a prefetch still in flight
+        self.hidden_time = 0.0  # Read time that prefetching took off the fault path
+
+    def _read(self, read):
+        start = time.perf_counter()
+        if self.io_latency:
+            time.sleep(self.io_latency)
+        data = read()
+        return data, time.perf_counter() - start
+
+    def after_access(self, process_id, page_number, locate):
+        """Issues the prefetches the policy asks for; `locate(key)` returns a reader, or None to skip the page."""
+        for page in self.prefetcher.on_access(process_id, page_number):
+            key = (process_id, page)
+            if key in self.buffer:
+                continue
+            read = locate(key)
+            if read is None:
+                continue
+            if len(self.buffer) >= self.buffer_pages:
+                dropped, future = self.buffer.popitem(last=False)
+                future.cancel()
+                self.wasted += 1
+                self.prefetcher.on_wasted(dropped)
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="prefetch")
+            self.buffer[key] = self.executor.submit(self._read, read)
+            self.issued += 1
+
+    def take(self, key):
+        """Returns (data, read seconds) for a buffered page, or None if it was not prefetched."""
+        future = self.buffer.pop(key, None)
+        if future is None:
+            return None
+        start = time.perf_counter()
+        data, seconds = future.result()
+        stall = time.perf_counter() - start
+        self.stall_time += stall
+        self.hidden_time += max(seconds - stall, 0.0)
+        self.useful += 1
+        self.prefetcher.on_useful(key)
+        return data, seconds
+
+    def demand_read(self, read):
+        """Reads a page on the fault path; returns (data, read seconds)."""
+        data, seconds = self._read(read)
+        self.major_faults += 1
+        self.demand_read_time += seconds
+        return data, seconds
+
+    def close(self):
+        """Drops whatever is still buffered (as wasted) and stops the I/O threads."""
+        for key, future in self.buffer.items():
+            future.cancel()
+            self.wasted += 1
+            self.prefetcher.on_wasted(key)
+        self.buffer.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def stats(self):
+        return {
+            "prefetcher": self.prefetcher.name,
+            "issued": self.issued,
+            "useful": self.useful,
+            "wasted": self.wasted,
+            "accuracy": self.useful / self.issued if self.issued else 0.0,
+            # Share of the reads from the backing store that prefetching served
+            "coverage": self.useful / (self.useful + self.major_faults) if self.useful + self.major_faults else 0.0,
+            "major_faults": self.major_faults,
+            "demand_read_time": self.demand_read_time,
+            "stall_time": self.stall_time,
+            "hidden_latency": self.hidden_time,
+        }
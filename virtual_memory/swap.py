@@ -0,0 +1,158 @@
+import mmap
+import re
+import time
+from array import array
+
+# Bitmap bytes with at least one free slot
+_FREE_BYTE = re.compile(b"[^\xff]")
+
+
+class DiskFullError(MemoryError):
+    """Raised when a page has to be swapped out but every swap slot is in use."""
+
+
+class SwapFile:
+    """Fixed-slot swap area in a memory-mapped file.
+
+    The file holds `slot_count` slots of `page_size` bytes. A bitmap marks
+    the used slots and a slot map tracks which page lives where. Page-out
+    copies the payload straight into the mapping through a memoryview and
+    page-in copies the slot out the same way, so neither goes through an
+    intermediate slice. A page read back can keep its slot (like the swap
+    cache) so it can be dropped again without a write, until `discard`
+    frees the slot once the copy goes stale. Bytes moved and time spent in
+    both directions are counted.
+    """
+
+    def __init__(self, path, slot_count, page_size):
+        if slot_count <= 0 or page_size <= 0:
+            raise ValueError("Swap file needs a positive slot count and page size")
+        self.path = path
+        self.slot_count = slot_count
+        self.page_size = page_size
+        self._file = open(path, "w+b")
+        self._file.truncate(slot_count * page_size)
+        self._map = mmap.mmap(self._file.fileno(), slot_count * page_size)
+        self._view = memoryview(self._map)
+        self.reset()
+
+    @classmethod
+    def for_disk(cls, path, disk_size, page_size):
+        """Creates a swap file with as many slots as whole pages fit in `disk_size` bytes."""
+        return cls(path, disk_size // page_size, page_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def reset(self):
+        """Frees every slot and clears the I/O counters; the file keeps its size."""
+        self.bitmap = bytearray((self.slot_count + 7) // 8)
+        if self.slot_count % 8:
+            self.bitmap[-1] = 0xFF << (self.slot_count % 8) & 0xFF  # Bits past the last slot never free up
+        self.slots = {}  # key -> slot
+        self.lengths = array("I", bytes(4 * self.slot_count))
+        self.hint = 0  # Bitmap byte where the search for a free slot resumes
+        self.page_ins = 0
+        self.page_outs = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.io_time = 0.0
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def free_slots(self):
+        return self.slot_count - len(self.slots)
+
+    def _take_slot(self):
+        match = _FREE_BYTE.search(self.bitmap, self.hint) or _FREE_BYTE.search(self.bitmap, 0, self.hint)
+        if match is None:
+            raise DiskFullError(f"Swap file {self.path} is full ({self.slot_count} slots)")
+        index = match.start()
+        byte = self.bitmap[index]
+        bit = (~byte & (byte + 1)).bit_length() - 1  # Lowest clear bit
+        self.bitmap[index] = byte | 1 << bit
+        self.hint = index
+        return index * 8 + bit
+
+    def check_payload(self, data):
+        """Returns a page payload as bytes-like, raising ValueError if it does not fit in a slot."""
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) > self.page_size:
+            raise ValueError(f"Page payload of {len(data)} bytes exceeds the {self.page_size}-byte page size")
+        return data
+
+    def page_out(self, key, data):
+        """Writes a page payload (bytes-like or str, at most page_size bytes) to a free slot."""
+        data = self.check_payload(data)
+        if key in self.slots:
+            slot = self.slots[key]
+        else:
+            slot = self._take_slot()
+            self.slots[key] = slot
+
+        start = time.perf_counter()
+        offset = slot * self.page_size
+        self._view[offset:offset + len(data)] = data
+        self.io_time += time.perf_counter() - start
+        self.lengths[slot] = len(data)
+        self.page_outs += 1
+        self.bytes_written += len(data)
+        return slot
+
+    def page_in(self, key, keep=False):
+        """Reads a swapped-out page back as bytes, freeing its slot unless `keep`."""
+        start = time.perf_counter()
+        data = self.read_slot(*self.locate(key))
+        self.release(key, time.perf_counter() - start, keep)
+        return data
+
+    def locate(self, key):
+        """Returns the (slot, length) of a swapped-out page."""
+        slot = self.slots[key]
+        return slot, self.lengths[slot]
+
+    def read_slot(self, slot, length):
+        """Copies a slot out without touching any bookkeeping, so I/O threads can call it.
+
+        The slot must stay reserved (not released) until the read is done.
+        """
+        offset = slot * self.page_size
+        return self._view[offset:offset + length].tobytes()
+
+    def release(self, key, io_time=0.0, keep=False):
+        """Counts the page-in of a page that has been read back and frees its slot unless `keep`."""
+        self.page_ins += 1
+        self.bytes_read += self.lengths[self.slots[key]]
+        self.io_time += io_time
+        if not keep:
+            self.discard(key)
+
+    def discard(self, key):
+        """Frees a page's slot without reading it."""
+        slot = self.slots.pop(key)
+        self.bitmap[slot // 8] &= ~(1 << slot % 8) & 0xFF
+
+    def stats(self):
+        return {
+            "slots": self.slot_count,
+            "used_slots": len(self.slots),
+            "page_ins": self.page_ins,
+            "page_outs": self.page_outs,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "io_time": self.io_time,
+        }
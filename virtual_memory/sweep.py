@@ -0,0 +1,46 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product, repeat
+
+from .virtual_memory import VirtualMemorySystem
+
+# Per-worker copy of the access sequence, set up once by _receive_pages
+_shared = {}
+
+
+def _receive_pages(pages, history_mode):
+    """Worker initializer: keeps the accesses for every configuration the worker runs."""
+    _shared["pages"] = pages
+    _shared["history_mode"] = history_mode
+
+
+def _run_config(algorithm, ram_size, disk_size, page_size):
+    """Runs one configuration on its own VirtualMemorySystem."""
+    system = VirtualMemorySystem(_shared["history_mode"])
+    try:
+        system.configure(ram_size, disk_size, page_size)
+        result = system.run_simulation(_shared["pages"], [algorithm])[algorithm]
+    finally:
+        system.close()
+    result["access_history"] = result["access_history"].counters()
+    return {"algorithm": algorithm, "ram_size": ram_size, "frames": system.frames, **result}
+
+
+def run_sweep(pages, algorithms, ram_sizes, disk_size, page_size, max_workers=None, history_mode="counters"):
+    """Runs every (algorithm, ram_size) combination of the virtual memory simulator in parallel.
+
+    `pages` is an iterable of (process_id, page_number, data[, access])
+    accesses, as for VirtualMemorySystem.run_simulation. It is sent once to
+    each worker, and each combination gets a fresh system backed by the
+    disk dict, so runs cannot affect each other. Results are returned in
+    combination order, with the access history reduced to its counters.
+    """
+    pages = list(pages)
+    configs = list(product(algorithms, ram_sizes))
+    if not configs:
+        return []
+
+    workers = min(max_workers or os.cpu_count() or 1, len(configs))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_receive_pages,
+                             initargs=(pages, history_mode)) as executor:
+        return list(executor.map(_run_config, *zip(*configs), repeat(disk_size), repeat(page_size)))
@@ -0,0 +1,178 @@
+import bz2
+import lzma
+import time
+import zlib
+from collections import OrderedDict
+from functools import partial
+
+# Maps codec names to (compressor factory taking a level, decompressor, default level).
+# zlib at level 1 is the fast end of the stdlib, the closest to lz4 as used by zram and zswap.
+CODECS = {
+    "zlib": (lambda level: partial(zlib.compress, level=level), zlib.decompress, 1),
+    "bz2": (lambda level: partial(bz2.compress, compresslevel=level), bz2.decompress, 9),
+    "lzma": (lambda level: partial(lzma.compress, preset=level), lzma.decompress, 0),
+}
+
+
+def available_codecs():
+    """Returns the names of the codecs a compressed tier can use."""
+    return list(CODECS)
+
+
+class CompressedTier:
+    """Compressed RAM pool between RAM and the backing store, like zram or zswap.
+
+    Pages evicted from RAM are compressed into a pool of `pool_bytes` bytes,
+    least recently stored first out. A fault on a pooled page decompresses it
+    instead of reading the disk, and a dirty page in the pool has not been
+    written back yet. Under pressure the oldest pages spill: dirty ones are
+    decompressed so the caller can write them back, clean ones are dropped.
+    Pages that do not compress smaller than they are bypass the pool.
+    `compress` and `spill_plan` change nothing, so a caller can check what
+    an eviction would write back before committing to it with `store`.
+
+    Compression and decompression are real and timed. Disk I/O is not
+    performed for the pages the pool keeps; each such read or write is
+    credited with `disk_latency` seconds of modelled device time instead.
+    """
+
+    def __init__(self, pool_bytes, codec="zlib", level=None, disk_latency=1e-4):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec} (available: {', '.join(CODECS)})")
+        if pool_bytes <= 0:
+            raise ValueError("Compressed tier needs a positive pool size")
+        make_compressor, self.decompressor, default_level = CODECS[codec]
+        self.codec = codec
+        self.level = default_level if level is None else level
+        self.compressor = make_compressor(self.level)
+        self.pool_bytes = pool_bytes
+        self.disk_latency = disk_latency
+        self.entries = OrderedDict()  # key -> (compressed payload, was a str, dirty), oldest first
+        self.used_bytes = 0
+        self.peak_bytes = 0
+        self.dirty_pages = 0
+        self.stores = 0
+        self.dirty_stores = 0
+        self.rejected = 0
+        self.hits = 0
+        self.spilled = 0
+        self.spilled_dirty = 0
+        self.original_bytes = 0
+        self.compressed_bytes = 0
+        self.compress_time = 0.0
+        self.decompress_time = 0.0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _decompress(self, payload, was_str):
+        start = time.perf_counter()
+        data = self.decompressor(payload)
+        self.decompress_time += time.perf_counter() - start
+        return data.decode() if was_str else data
+
+    def compress(self, data):
+        """Compresses a page without storing it.
+
+        Returns (payload, was a str, original length, seconds) for `store`;
+        the payload is None when the page would not be kept.
+        """
+        was_str = isinstance(data, str)
+        raw = data.encode() if was_str else data
+        start = time.perf_counter()
+        payload = self.compressor(raw)
+        seconds = time.perf_counter() - start
+        if len(payload) >= len(raw) or len(payload) > self.pool_bytes:
+            payload = None
+        return payload, was_str, len(raw), seconds
+
+    def spill_plan(self, size, leaving=None):
+        """Returns the keys `overflow` would spill after `leaving` is loaded and `size` bytes are stored."""
+        excess = self.used_bytes + size - self.pool_bytes
+        if leaving in self.entries:
+            excess -= len(self.entries[leaving][0])
+        keys = []
+        for key, (payload, _, _) in self.entries.items():
+            if excess <= 0:
+                break
+            if key != leaving:
+                keys.append(key)
+                excess -= len(payload)
+        return keys
+
+    def is_dirty(self, key):
+        return self.entries[key][2]
+
+    def store(self, key, compressed, dirty):
+        """Adds a page compressed by `compress` to the pool; returns False if it was not kept."""
+        payload, was_str, original_size, seconds = compressed
+        self.compress_time += seconds
+        if payload is None:
+            self.rejected += 1
+            return False
+
+        self.entries[key] = (payload, was_str, dirty)
+        self.used_bytes += len(payload)
+        self.peak_bytes = max(self.peak_bytes, self.used_bytes)
+        self.stores += 1
+        self.original_bytes += original_size
+        self.compressed_bytes += len(payload)
+        if dirty:
+            self.dirty_pages += 1
+            self.dirty_stores += 1
+        return True
+
+    def load(self, key):
+        """Takes a page out of the pool on a fault; returns (data, dirty)."""
+        payload, was_str, dirty = self.entries.pop(key)
+        self.used_bytes -= len(payload)
+        if dirty:
+            self.dirty_pages -= 1
+        self.hits += 1
+        return self._decompress(payload, was_str), dirty
+
+    def overflow(self):
+        """Spills the oldest pages until the pool fits its budget.
+
+        Returns (key, data) for each dirty page spilled, which the caller
+        must write back; clean pages are simply dropped.
+        """
+        spilled = []
+        while self.used_bytes > self.pool_bytes:
+            key, (payload, was_str, dirty) = self.entries.popitem(last=False)
+            self.used_bytes -= len(payload)
+            self.spilled += 1
+            if dirty:
+                self.dirty_pages -= 1
+                self.spilled_dirty += 1
+                spilled.append((key, self._decompress(payload, was_str)))
+        return spilled
+
+    def stats(self):
+        reads_avoided = self.hits
+        writes_avoided = self.dirty_stores - self.spilled_dirty
+        io_time_saved = (reads_avoided + writes_avoided) * self.disk_latency
+        cpu_time = self.compress_time + self.decompress_time
+        return {
+            "codec": self.codec,
+            "level": self.level,
+            "pool_bytes": self.pool_bytes,
+            "used_bytes": self.used_bytes,
+            "peak_bytes": self.peak_bytes,
+            "pages": len(self.entries),
+            "stores": self.stores,
+            "rejected": self.rejected,
+            "hits": self.hits,
+            "spilled": self.spilled,
+            "spilled_dirty": self.spilled_dirty,
+            "compression_ratio": self.original_bytes / self.compressed_bytes if self.compressed_bytes else 0.0,
+            "compress_time": self.compress_time,
+            "decompress_time": self.decompress_time,
+            "reads_avoided": reads_avoided,
+            "writes_avoided": writes_avoided,
+            "io_time_saved": io_time_saved,
+            "net_time_saved": io_time_saved - cpu_time,
+        }
@@ -1,91 +1,395 @@
-from PyQt6.QtCore import QObject, pyqtSignal
-from collections import deque
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from collections import OrderedDict
+from functools import partial
 
-class VirtualMemorySystem(QObject):
-    page_loaded = pyqtSignal(dict)  # {process_id, page_number, status, location}
-    simulation_complete = pyqtSignal(dict)  # {algorithm, hits, faults}
-    visualization_ready = pyqtSignal(object)  # Emits a Matplotlib figure object
+from events.observable import Observable
+from paging.trace import TraceFile
+from .history import LOCATION_NAMES, LOCATION_RAM, LOCATION_REPLACED, LOCATION_REPLACED_DIRTY, STATUS_FAULT, \
+    STATUS_HIT, STATUS_NAMES, AccessHistory
+from .prefetch import PrefetchEngine, create_prefetcher
+from .swap import DiskFullError, SwapFile
+from .tiers import CompressedTier
+from .writeback import READ, WRITE_ACCESSES, create_writeback_policy
 
-    def __init__(self):
+
+class VirtualMemorySystem(Observable):
+    """Demand paging between RAM and disk, with no GUI dependencies.
+
+    Observers receive "page_loaded" events ({process_id, page_number, status,
+    location}) and one "simulation_complete" event with the results.
+    Each run records its accesses in an AccessHistory whose detail is set by
+    `history_mode` ("off", "counters", "sampled" every `sample_every`
+    accesses, or "full"); results hold the recorder itself, not a copy.
+    With `configure_prefetch`, evicted pages are also read ahead of demand.
+
+    Accesses are reads unless their optional fourth field is "W". Written
+    pages are dirty until written back: a clean victim is simply dropped
+    (its backing copy is remembered in `disk`, so a refault reads it back),
+    and only dirty victims (or a background flusher, see
+    `configure_writeback`) write to the backing store. Algorithm names such
+    as "LRU-clean-first" select variants that prefer clean victims.
+
+    With `configure_compressed_tier`, victims are compressed into a RAM pool
+    first and only spill to the backing store under pressure, giving a
+    RAM / compressed RAM / disk hierarchy.
+    """
+
+    def __init__(self, history_mode="full", sample_every=1000):
         super().__init__()
+        self.history_mode = history_mode
+        self.sample_every = sample_every
         self.ram_size = 0
         self.disk_size = 0
         self.page_size = 0
         self.frames = 0
+        self.swap = None
+        self.prefetch_config = None
+        self.prefetch = None
+        self.flush_interval = None
+        self.flush_batch = 32
+        self.clean_scan = 8
+        self.tier_config = None
         self.reset_state()
 
     def reset_state(self):
         self.ram = {}
         self.disk = {}
-        self.page_order = deque()
+        if self.swap is not None:
+            self.swap.reset()
+        if self.prefetch is not None:
+            self.prefetch.close()
+            self.prefetch = None
+        if self.prefetch_config is not None:
+            name, params, engine_options = self.prefetch_config
+            self.prefetch = PrefetchEngine(create_prefetcher(name, **params), **engine_options)
+        self.compressed = CompressedTier(**self.tier_config) if self.tier_config is not None else None
+        self.policy = None
         self.page_faults = 0
         self.page_hits = 0
-        self.access_history = []
+        self.dirty = OrderedDict()  # Dirty resident pages, oldest first
+        self.writes = 0
+        self.clean_evictions = 0
+        self.dirty_writebacks = 0
+        self.flush_batches = 0
+        self.flushed_pages = 0
+        self.since_flush = 0
+        self.disk_reads = 0
+        self.access_history = AccessHistory(self.history_mode, self.sample_every)
 
-    def configure(self, ram_size, disk_size, page_size):
+    def configure(self, ram_size, disk_size, page_size, swap_path=None):
+        """Sets the memory geometry.
+
+        With `swap_path`, dirty victims go to a memory-mapped swap file of
+        disk_size // page_size slots instead of the `disk` dict, and
+        faulting pages are read back from it. When an eviction would write
+        back more pages than there are free slots, `load_page` raises
+        DiskFullError, and a written payload larger than a slot raises
+        ValueError. Both are raised before any page, slot or counter
+        changes, and the policy is put back as it was before choosing the
+        victim (except that clean-first variants keep the second chance
+        given to the dirty candidates they passed over). Raises ValueError
+        unless the page size is positive and RAM holds at least one page.
+        """
+        if page_size <= 0:
+            raise ValueError("Page size must be positive")
+        if ram_size < page_size:
+            raise ValueError(f"RAM of {ram_size} bytes holds no {page_size}-byte page")
+        self.close()
         self.ram_size = ram_size
         self.disk_size = disk_size
         self.page_size = page_size
         self.frames = ram_size // page_size
+        if swap_path is not None:
+            self.swap = SwapFile.for_disk(swap_path, disk_size, page_size)
+        self.reset_state()
+
+    def configure_prefetch(self, prefetcher=None, buffer_pages=32, workers=2, io_latency=0.0, **params):
+        """Selects a registered prefetcher ("sequential", "stride"), or turns prefetching off with None.
+
+        Evicted pages it asks for are read from the swap file (or the disk
+        dict) on `workers` I/O threads into a staging buffer of
+        `buffer_pages` pages. Every read from the backing store then costs
+        `io_latency` seconds, and results gain a "prefetch" report with
+        accuracy, coverage, wasted loads and hidden latency. Extra keyword
+        arguments go to the prefetcher.
+        """
+        if prefetcher is None:
+            self.prefetch_config = None
+        else:
+            create_prefetcher(prefetcher, **params)  # Fail here on a bad name or parameter
+            self.prefetch_config = (prefetcher, params,
+                                    {"buffer_pages": buffer_pages, "workers": workers, "io_latency": io_latency})
         self.reset_state()
 
-    def load_page(self, process_id, page_number, data, algorithm="FIFO"):
+    def configure_writeback(self, flush_interval=None, flush_batch=32, clean_scan=8):
+        """Sets up dirty page write-back.
+
+        With `flush_interval`, a background flusher runs every that many
+        accesses and writes back up to `flush_batch` of the oldest dirty
+        pages in one batch; they stay resident, now clean. `clean_scan` is
+        how many candidates the clean-first variants examine per eviction.
+        """
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.clean_scan = clean_scan
+        self.reset_state()
+
+    def configure_compressed_tier(self, pool_bytes=None, codec="zlib", level=None, disk_latency=1e-4):
+        """Adds a compressed RAM tier of `pool_bytes` bytes between RAM and disk, or removes it with None.
+
+        `codec` is "zlib", "bz2" or "lzma" at compression `level` (default:
+        the codec's own, level 1 for zlib). `disk_latency` is the modelled
+        cost in seconds of each disk read or write the tier avoids. Results
+        gain a "tiers" report with hits per tier, compression ratio, CPU
+        time spent compressing and I/O time saved.
+        """
+        if pool_bytes is None:
+            self.tier_config = None
+        else:
+            CompressedTier(pool_bytes, codec, level)  # Fail here on a bad codec or size
+            self.tier_config = {"pool_bytes": pool_bytes, "codec": codec, "level": level,
+                                "disk_latency": disk_latency}
+        self.reset_state()
+
+    def close(self):
+        """Releases the swap file and the prefetch I/O threads, if any."""
+        if self.prefetch is not None:
+            self.prefetch.close()
+            self.prefetch = None
+        if self.swap is not None:
+            self.swap.close()
+            self.swap = None
+
+    def create_policy(self, algorithm):
+        """Returns the replacement policy for an algorithm name from the shared registry."""
+        return create_writeback_policy(algorithm, self.frames, self.dirty, self.clean_scan)
+
+    def load_page(self, process_id, page_number, data, algorithm="FIFO", access=READ):
         key = (process_id, page_number)
-        result = {"process_id": process_id, "page_number": page_number, "algorithm": algorithm, "status": None, "location": None}
+        if self.swap is not None and access in WRITE_ACCESSES:
+            self.swap.check_payload(data)  # Fail before anything changes, not at write-back
+
+        if self.policy is None or self.policy.name != algorithm:
+            # Switching algorithms mid-run: hand the resident pages to the new policy
+            self.policy = self.create_policy(algorithm)
+            if self.policy.needs_lookahead:
+                raise ValueError(f"{algorithm} needs the whole access sequence in advance; use run_simulation")
+            for resident in self.ram:
+                self.policy.on_miss(resident)
 
         if key in self.ram:
             self.page_hits += 1
-            if algorithm == "LRU":
-                self.page_order.remove(key)
-                self.page_order.append(key)
-            result.update({"status": "hit", "location": "RAM"})
+            self.policy.on_hit(key)
+            status, location = STATUS_HIT, LOCATION_RAM
         else:
+            victim = None
+            if len(self.ram) >= self.frames:
+                victim = self.replace_page(key)
+                writes, compressed = self._plan_eviction(victim, key)
+                # Checked before anything changes; the policy undoes its choice
+                if self.swap is not None and self.swap.free_slots < writes:
+                    self.policy.restore(victim)
+                    raise DiskFullError(f"No swap slot left to write back {writes} page(s) to evict {victim} "
+                                        f"and load {key}")
+            contents = data
+            if self.compressed is not None and key in self.compressed:
+                contents, dirty = self.compressed.load(key)
+                if dirty:
+                    self.dirty[key] = None
+            elif self.swap is not None and key in self.swap or key in self.disk:
+                contents = self._read_back(key)
+                self.disk_reads += 1
             self.page_faults += 1
-            if len(self.ram) < self.frames:
-                self.ram[key] = data
-                result["location"] = "RAM"
-            else:
-                evicted = self.replace_page(algorithm)
-                self.disk[evicted] = self.ram.pop(evicted)
-                self.ram[key] = data
-                result["location"] = "RAM (replaced)"
-            self.page_order.append(key)
-            result["status"] = "fault"
-
-        self.access_history.append(result)
-        self.page_loaded.emit(result)
+            location = LOCATION_RAM if victim is None else self._evict(victim, compressed)
+            self.ram[key] = contents
+            self.policy.on_miss(key)
+            status = STATUS_FAULT
+
+        if access in WRITE_ACCESSES:
+            self.ram[key] = data
+            self.writes += 1
+            if key not in self.dirty:
+                self.dirty[key] = None
+                if self.swap is not None and key in self.swap:
+                    self.swap.discard(key)  # The swap copy is stale now
+        if self.flush_interval is not None:
+            self.since_flush += 1
+            if self.since_flush >= self.flush_interval:
+                self.flush_dirty()
+
+        if self.prefetch is not None:
+            self.prefetch.after_access(process_id, page_number, self._reader)
+        self.access_history.record(process_id, page_number, status, location)
+        result = {"process_id": process_id, "page_number": page_number, "algorithm": algorithm,
+                  "status": STATUS_NAMES[status], "location": LOCATION_NAMES[location]}
+        if self.observers:
+            self.notify("page_loaded", result)
         return result
 
-    def replace_page(self, algorithm):
-        if algorithm == "FIFO":
-            return self.page_order.popleft()
-        elif algorithm == "LRU":
-            return self.page_order.popleft()
-        elif algorithm == "Optimal":
-            future_access = {key: i for i, key in enumerate(self.page_order)}
-            return max(future_access, key=future_access.get)
-        return self.page_order.popleft()
+    def _write_back(self, key, data):
+        if self.swap is not None:
+            self.swap.page_out(key, data)
+        else:
+            self.disk[key] = data
+
+    def _plan_eviction(self, victim, key):
+        """Returns (pages the eviction will write back, the victim compressed for the tier or None) without changing anything.
+
+        With a compressed tier these are the dirty pages the pool would
+        spill once `key` has left it and the victim has been stored.
+        """
+        dirty = victim in self.dirty
+        if self.compressed is None:
+            return int(dirty), None
+        compressed = self.compressed.compress(self.ram[victim])
+        if compressed[0] is None:
+            return int(dirty), compressed
+        spills = self.compressed.spill_plan(len(compressed[0]), leaving=key)
+        return sum(map(self.compressed.is_dirty, spills)), compressed
+
+    def _evict(self, victim, compressed=None):
+        """Removes a victim from RAM, writing it back only if it is dirty; returns the location code.
+
+        A clean victim needs no write, but a page dropped for the first time
+        is remembered in `disk` as the copy it was demand-loaded from (the
+        program image or file behind it), so a refault counts as a disk
+        read. With a compressed tier the victim (already compressed by
+        `_plan_eviction`) goes there first, and only the dirty pages it
+        spills are written back.
+        """
+        data = self.ram.pop(victim)
+        dirty = victim in self.dirty
+        if dirty:
+            del self.dirty[victim]
+        elif self.swap is None or victim not in self.swap:
+            self.disk[victim] = data
+        if self.compressed is not None and self.compressed.store(victim, compressed, dirty):
+            for key, spilled in self.compressed.overflow():
+                self._write_back(key, spilled)
+                self.dirty_writebacks += 1
+        elif dirty:
+            self._write_back(victim, data)
+            self.dirty_writebacks += 1
+        if dirty:
+            return LOCATION_REPLACED_DIRTY
+        self.clean_evictions += 1
+        return LOCATION_REPLACED
+
+    def flush_dirty(self, limit=None):
+        """Writes back up to `limit` (default: flush_batch) of the oldest dirty pages as one batch.
+
+        The pages stay resident and become clean. Stops early when the swap
+        file has no slot left. Returns the number of pages written.
+        """
+        self.since_flush = 0
+        count = 0
+        limit = self.flush_batch if limit is None else limit
+        while self.dirty and count < limit:
+            key = next(iter(self.dirty))
+            if self.swap is not None and key not in self.swap and not self.swap.free_slots:
+                break
+            del self.dirty[key]
+            self._write_back(key, self.ram[key])
+            count += 1
+        if count:
+            self.flush_batches += 1
+            self.flushed_pages += count
+        return count
+
+    def writeback_stats(self):
+        accesses = self.page_hits + self.page_faults
+        return {
+            "reads": accesses - self.writes,
+            "writes": self.writes,
+            "clean_evictions": self.clean_evictions,
+            "dirty_writebacks": self.dirty_writebacks,
+            "flush_batches": self.flush_batches,
+            "flushed_pages": self.flushed_pages,
+            "dirty_resident": len(self.dirty),
+        }
+
+    def tier_stats(self):
+        compressed_hits = self.compressed.hits if self.compressed is not None else 0
+        return {
+            "ram_hits": self.page_hits,
+            "compressed_hits": compressed_hits,
+            "disk_hits": self.disk_reads,
+            "cold_faults": self.page_faults - compressed_hits - self.disk_reads,
+            "compressed": self.compressed.stats() if self.compressed is not None else None,
+        }
+
+    def _reader(self, key):
+        """Returns a thread-safe callable that reads an evicted page, or None if it is not on disk."""
+        if key in self.ram or self.compressed is not None and key in self.compressed:
+            return None
+        if self.swap is not None and key in self.swap:
+            return partial(self.swap.read_slot, *self.swap.locate(key))
+        if key in self.disk:
+            data = self.disk[key]
+            return lambda: data
+        return None
+
+    def _read_back(self, key):
+        """Reads an evicted page back, from the prefetch buffer when it is already there.
+
+        A page read from the swap file keeps its slot while it stays clean,
+        so evicting it again needs no write.
+        """
+        in_swap = self.swap is not None and key in self.swap
+        if self.prefetch is None:
+            return self.swap.page_in(key, keep=True) if in_swap else self.disk[key]
+        data, seconds = self.prefetch.take(key) or self.prefetch.demand_read(self._reader(key))
+        if in_swap:
+            self.swap.release(key, seconds, keep=True)
+        return data
+
+    def replace_page(self, key):
+        """Asks the current policy for the page to evict so that key can be loaded."""
+        return self.policy.choose_victim(key)
 
     def run_simulation(self, pages, algorithms=["FIFO", "LRU", "Optimal"]):
         results = {}
+        keys = None
         for algo in algorithms:
             self.reset_state()
-            for process_id, page_number, data in pages:
-                self.load_page(process_id, page_number, data, algo)
-            results[algo] = {"hits": self.page_hits, "faults": self.page_faults, "access_history": self.access_history.copy()}
+            self.access_history.algorithm = algo
+            self.policy = self.create_policy(algo)
+            if self.policy.needs_lookahead:
+                # Belady needs the next use of every access before the run starts
+                if keys is None:
+                    keys = [(entry[0], entry[1]) for entry in pages]
+                self.policy.prepare(keys)
+            progress = self.track_progress(pages, algo, lambda: {"hits": self.page_hits, "faults": self.page_faults})
+            for process_id, page_number, data, *access in progress:
+                self.load_page(process_id, page_number, data, algo, access[0] if access else READ)
+            results[algo] = {"hits": self.page_hits, "faults": self.page_faults, "access_history": self.access_history,
+                             "writeback": self.writeback_stats()}
+            if self.prefetch is not None:
+                self.prefetch.close()
+                results[algo]["prefetch"] = self.prefetch.stats()
+            if self.swap is not None:
+                results[algo]["swap"] = self.swap.stats()
+            if self.compressed is not None:
+                results[algo]["tiers"] = self.tier_stats()
 
-        self.simulation_complete.emit(results)
-        self.visualization_ready.emit(self.create_visualization(results))
+        if self.observers:
+            self.notify("simulation_complete", results)
         return results
 
-    def create_visualization(self, results):
-        fig, axes = plt.subplots(1, 3, figsize=(12, 4))
+    def run_trace_file(self, path, algorithms=["FIFO", "LRU", "Optimal"], data="data"):
+        """Runs the simulation over a binary trace file, streaming it from disk in chunks."""
+        with TraceFile(path) as trace:
+            return self.run_simulation(trace.with_data(data), algorithms)
+
+    def create_visualization(self, results, output_path=None):
+        """Charts hits and faults per algorithm; returns the figure, or the saved path with `output_path`."""
+        from charts.figures import new_figure, save_figure  # Loaded on first use so the core stays headless
+
+        fig, axes = new_figure(max(len(results), 1), figsize=(4 * max(len(results), 1), 4))
         for ax, (algo, data) in zip(axes, results.items()):
             ax.bar(['Hits', 'Faults'], [data['hits'], data['faults']], color=['green', 'red'])
             ax.set_title(f'{algo} Performance')
             ax.set_ylabel('Count')
 
-        plt.tight_layout()
-        return fig  # Returning the figure object instead of saving it
+        if output_path is not None:
+            return save_figure(fig, output_path)
+        return fig
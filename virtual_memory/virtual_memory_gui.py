@@ -1,5 +1,9 @@
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QLineEdit, QTextEdit
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from functools import partial
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QTextEdit, \
+    QProgressBar
+from charts.figures import update_bars
+from events.qt_bridge import QtEventBridge, start_worker
 from .virtual_memory import VirtualMemorySystem
 
 class VirtualMemoryGUI(QWidget):
@@ -7,8 +11,13 @@ class VirtualMemoryGUI(QWidget):
         super().__init__()
         self.init_ui()
         self.vm_system = VirtualMemorySystem()
-        self.vm_system.simulation_complete.connect(self.display_results)
-        self.vm_system.visualization_ready.connect(self.show_visualization)
+        self.worker = None
+        self.algorithms = []
+        # Per-access page_loaded events stay on the worker thread
+        self.events = QtEventBridge(self.vm_system, self, events=("progress", "simulation_complete"))
+        self.events.subscribe("progress", self.update_progress)
+        self.events.subscribe("simulation_complete", self.display_results)
+        self.events.subscribe("simulation_complete", self.visualize_results)
 
     def init_ui(self):
         self.setWindowTitle("Virtual Memory Simulator")
@@ -33,14 +42,25 @@ class VirtualMemoryGUI(QWidget):
         layout.addWidget(self.page_size_input)
 
         self.pages_input = QTextEdit(self)
-        self.pages_input.setPlaceholderText("Enter Pages (format: process_id:page_number:data, ...)")
+        self.pages_input.setPlaceholderText("Enter Pages (format: process_id:page_number:data[:R|W], ...)")
         layout.addWidget(QLabel("Pages:"))
         layout.addWidget(self.pages_input)
 
+        buttons = QHBoxLayout()
         self.run_button = QPushButton("Run Simulation")
         self.run_button.setStyleSheet("background-color: #D8BFD8; color: black;")  # Thistle button
         self.run_button.clicked.connect(self.run_simulation)
-        layout.addWidget(self.run_button)
+        buttons.addWidget(self.run_button)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet("background-color: #D8BFD8; color: black;")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_simulation)
+        buttons.addWidget(self.cancel_button)
+        layout.addLayout(buttons)
+
+        self.progress_bar = QProgressBar(self)
+        layout.addWidget(self.progress_bar)
 
         self.result_label = QLabel("Results:")
         layout.addWidget(self.result_label)
@@ -53,29 +73,72 @@ class VirtualMemoryGUI(QWidget):
         self.setLayout(layout)
 
     def run_simulation(self):
-        ram_size = int(self.ram_input.text())
-        disk_size = int(self.disk_input.text())
-        page_size = int(self.page_size_input.text())
-
-        self.vm_system.configure(ram_size, disk_size, page_size)
+        try:
+            ram_size = int(self.ram_input.text())
+            disk_size = int(self.disk_input.text())
+            page_size = int(self.page_size_input.text())
+            self.vm_system.configure(ram_size, disk_size, page_size)
+        except ValueError as error:
+            self.result_text.setText(f"Invalid input: {error}")
+            return
 
         pages = []
         raw_input = self.pages_input.toPlainText().split(",")
         for entry in raw_input:
             parts = entry.strip().split(":")
-            if len(parts) == 3:
-                pages.append((int(parts[0]), int(parts[1]), parts[2]))
-
-        results = self.vm_system.run_simulation(pages)
-        self.display_results(results)
+            if len(parts) in (3, 4):
+                pages.append((int(parts[0]), int(parts[1]), *parts[2:]))
+
+        # The run happens on a worker thread; results arrive through the event bridge
+        self.algorithms = ["FIFO", "LRU", "Optimal"]
+        self.show_visualization(self.vm_system.create_visualization(
+            {algo: {"hits": 0, "faults": 0} for algo in self.algorithms}))
+        self.progress_bar.setValue(0)
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.worker = start_worker(self, self.vm_system, partial(self.vm_system.run_simulation, pages, self.algorithms),
+                                   cancelled=self.simulation_cancelled, failed=self.simulation_failed)
+        self.worker.done.connect(self.simulation_done)
+
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def simulation_cancelled(self):
+        self.result_text.setText("Simulation cancelled.")
+
+    def simulation_failed(self, message):
+        self.result_text.setText(f"Simulation failed: {message}")
+
+    def simulation_done(self):
+        self.worker = None
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def update_progress(self, progress):
+        """Advances the progress bar and the live hit/fault bars of the running algorithm."""
+        if progress["label"] not in self.algorithms or self.canvas is None:
+            return
+        position = self.algorithms.index(progress["label"])
+        if progress["total"]:
+            self.progress_bar.setValue(100 * (position * progress["total"] + progress["done"])
+                                       // (len(self.algorithms) * progress["total"]))
+        update_bars(self.canvas.figure.axes[position], [progress["hits"], progress["faults"]])
+        self.canvas.draw_idle()
 
     def display_results(self, results):
+        self.progress_bar.setValue(100)
         output = ""
         for algo, data in results.items():
             output += f"{algo}: Page Hits = {data['hits']}, Page Faults = {data['faults']}\n"
         self.result_text.setText(output)
 
+    def visualize_results(self, results):
+        self.show_visualization(self.vm_system.create_visualization(results))
+
     def show_visualization(self, fig):
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas  # Loaded with the first chart
+
         if self.canvas is not None:
             self.layout().removeWidget(self.canvas)
             self.canvas.deleteLater()
@@ -0,0 +1,52 @@
+from paging.policies import ReplacementPolicy, create_policy
+
+# Access types accepted as the optional fourth field of a page access
+READ = "R"
+WRITE = "W"
+WRITE_ACCESSES = frozenset((WRITE, "w", "write"))
+
+# Appending this to FIFO, LRU or CLOCK selects its clean-first variant, e.g. "LRU-clean-first"
+CLEAN_FIRST_SUFFIX = "-clean-first"
+CLEAN_FIRST_BASES = ("FIFO", "LRU", "CLOCK")
+
+
+class CleanFirstPolicy(ReplacementPolicy):
+    """Prefers clean victims, which can be dropped without a write-back.
+
+    Asks the wrapped policy for victims in its usual order; each dirty
+    candidate is handed straight back through `on_miss` (a second chance, as
+    in the enhanced CLOCK algorithm) and the next one is tried. After `scan`
+    dirty candidates in a row the last one is evicted anyway. `restore`
+    puts back only the victim; the dirty candidates passed over keep the
+    second chance they were given.
+    """
+
+    def __init__(self, base, dirty, scan=8):
+        super().__init__(base.num_frames)
+        self.name = base.name + CLEAN_FIRST_SUFFIX
+        self.base = base
+        self.dirty = dirty  # The simulator's set of dirty resident pages
+        self.scan = scan
+        self.on_hit = base.on_hit
+        self.on_miss = base.on_miss
+
+    def choose_victim(self, key):
+        for _ in range(self.scan - 1):
+            victim = self.base.choose_victim(key)
+            if victim not in self.dirty:
+                return victim
+            self.base.on_miss(victim)
+        return self.base.choose_victim(key)
+
+    def restore(self, victim):
+        self.base.restore(victim)
+
+
+def create_writeback_policy(algorithm, num_frames, dirty, scan=8):
+    """Returns the registered policy, or the clean-first variant for a name ending in CLEAN_FIRST_SUFFIX."""
+    if not algorithm.endswith(CLEAN_FIRST_SUFFIX):
+        return create_policy(algorithm, num_frames)
+    base_name = algorithm[:-len(CLEAN_FIRST_SUFFIX)]
+    if base_name not in CLEAN_FIRST_BASES:
+        raise ValueError(f"No clean-first variant of {base_name} (available for {', '.join(CLEAN_FIRST_BASES)})")
+    return CleanFirstPolicy(create_policy(base_name, num_frames), dirty, scan)